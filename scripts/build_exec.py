@@ -17,6 +17,7 @@ def build_iwb2svg():
             "--onefile",
             "--console",
             "--name", "iwb2svg",
+            "--hidden-import=lxml",
         ])
         return True
     except Exception as e:
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+"""Helpers for running page conversions in worker processes."""
+
+from collections import deque
+
+
+def map_bounded(executor, fn, *iterables, max_pending):
+    """
+    Like executor.map, but with at most max_pending calls submitted and not yet
+    consumed.
+
+    executor.map submits every item up front, draining the input iterables and
+    letting results pile up while the caller processes them; this keeps both
+    the input and the output streaming.
+
+    Args:
+        executor: concurrent.futures executor to submit the calls to
+        fn: Callable to run for each item
+        *iterables: Iterables supplying the positional arguments of fn
+        max_pending: Maximum number of calls submitted but not yet consumed
+
+    Yields:
+        The results of fn, in input order
+    """
+    pending = deque()
+    for args in zip(*iterables):
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, *args))
+    while pending:
+        yield pending.popleft().result()
@@ -4,8 +4,8 @@
 
 import sys
 import argparse
-import tempfile
 import logging
+import multiprocessing
 
 from newline_iwb_converter import iwb2svg, __version__, configure_logging
 from newline_iwb_converter.pdf_engines import InkscapeEngine, SvglibEngine
@@ -13,36 +13,34 @@ from newline_iwb_converter.pdf_engines import InkscapeEngine, SvglibEngine
 logger = logging.getLogger("newline_iwb_converter.iwb2pdf")
 
 
-def get_pdf_engine(use_inkscape=None):
+def get_pdf_engine(use_inkscape=None, inkscape_path=None):
     """
     Get the appropriate PDF conversion engine.
 
     Args:
         use_inkscape: If True, use Inkscape. If False, use svglib.
                       If None, auto-detect (prefer Inkscape if available).
+        inkscape_path: Path to the Inkscape executable.
+                       If None, it is looked up in PATH.
 
     Returns:
         An instance of the selected PDF engine.
     """
-    # Auto-detect Inkscape if not explicitly specified
-    if use_inkscape is None:
-        inkscape_engine = InkscapeEngine()
-        use_inkscape = inkscape_engine.is_available()
-
-    if use_inkscape:
-        inkscape_engine = InkscapeEngine()
+    # Probe Inkscape once, both to auto-detect it and to use it when requested
+    if use_inkscape is not False:
+        inkscape_engine = InkscapeEngine(inkscape_path)
         if inkscape_engine.is_available():
             inkscape_path = inkscape_engine.find_inkscape()
             logger.info(f"Using Inkscape for SVG to PDF conversion: {inkscape_path}")
             return inkscape_engine
-        else:
+        elif use_inkscape:
             logger.warning("Inkscape requested but not found, falling back to svglib")
 
     logger.debug("Using svglib for PDF conversion")
     return SvglibEngine()
 
 
-def combine_svgs_to_pdf(svg_dir, output_pdf, uniform_size=False, use_inkscape=None):
+def combine_svgs_to_pdf(svg_dir, output_pdf, uniform_size=False, use_inkscape=None, jobs=None, inkscape_path=None):
     """
     Combine multiple SVG files from a directory into a single PDF.
     
@@ -53,13 +51,38 @@ def combine_svgs_to_pdf(svg_dir, output_pdf, uniform_size=False, use_inkscape=No
                       If False, each page is sized independently (default).
         use_inkscape: If True, use Inkscape for conversion. If False, use svglib.
                       If None, auto-detect (use Inkscape if available).
+        jobs: Number of worker processes used to render pages (svglib only).
+              If None, use one per CPU.
+        inkscape_path: Path to the Inkscape executable.
+                       If None, it is looked up in PATH.
     """
     logger.debug(f"Combining SVGs from {svg_dir} into {output_pdf}")
-    engine = get_pdf_engine(use_inkscape)
-    engine.combine_svgs_to_pdf(svg_dir, output_pdf, uniform_size=uniform_size)
+    engine = get_pdf_engine(use_inkscape, inkscape_path)
+    engine.combine_svgs_to_pdf(svg_dir, output_pdf, uniform_size=uniform_size, jobs=jobs)
 
 
-def extract_iwb_to_pdf(iwb_path, output_pdf, fix_fills=True, fix_size=True, delete_background=False, uniform_size=False, use_inkscape=None):
+def combine_svg_pages_to_pdf(svg_pages, output_pdf, uniform_size=False, use_inkscape=None, jobs=None, inkscape_path=None):
+    """
+    Combine in-memory SVG documents into a single PDF.
+    
+    Args:
+        svg_pages: SVG documents as bytes, in page order
+        output_pdf: Path to output PDF file
+        uniform_size: If True, all pages have the size of the largest page.
+                      If False, each page is sized independently (default).
+        use_inkscape: If True, use Inkscape for conversion. If False, use svglib.
+                      If None, auto-detect (use Inkscape if available).
+        jobs: Number of worker processes used to render pages (svglib only).
+              If None, use one per CPU.
+        inkscape_path: Path to the Inkscape executable.
+                       If None, it is looked up in PATH.
+    """
+    logger.debug(f"Combining {len(svg_pages)} SVG page(s) into {output_pdf}")
+    engine = get_pdf_engine(use_inkscape, inkscape_path)
+    engine.combine_svg_bytes_to_pdf(svg_pages, output_pdf, uniform_size=uniform_size, jobs=jobs)
+
+
+def extract_iwb_to_pdf(iwb_path, output_pdf, fix_fills=True, fix_size=True, delete_background=False, uniform_size=False, use_inkscape=None, jobs=None, inkscape_path=None):
     """
     Extract an IWB file and convert it to PDF.
     
@@ -72,31 +95,35 @@ def extract_iwb_to_pdf(iwb_path, output_pdf, fix_fills=True, fix_size=True, dele
         uniform_size: If True, all pages have the size of the largest page
         use_inkscape: If True, use Inkscape for conversion. If False, use svglib.
                       If None, auto-detect (use Inkscape if available).
+        jobs: Number of worker processes used to convert and render pages.
+              If None, use one per CPU. 1 disables parallelism.
+        inkscape_path: Path to the Inkscape executable.
+                       If None, it is looked up in PATH.
     """
     logger.info(f"Starting IWB to PDF conversion: {iwb_path} -> {output_pdf}")
-    # Create temporary directory for SVG extraction
-    with tempfile.TemporaryDirectory() as temp_dir:
-        logger.debug(f"Extracting SVGs to temporary directory: {temp_dir}")
-        
-        # Extract SVGs using iwb2svg
-        iwb2svg.extract_iwb_to_svg(
-            iwb_path,
-            temp_dir,
-            fix_fills=fix_fills,
-            fix_size=fix_size,
-            images_mode="data_uri",
-            delete_background=delete_background,
-        )
-        
-        logger.debug(f"Converting SVGs to PDF: {output_pdf}")
-        
-        # Combine SVGs to PDF
-        combine_svgs_to_pdf(temp_dir, output_pdf, uniform_size=uniform_size, use_inkscape=use_inkscape)
+    # Extract SVGs using iwb2svg, keeping the pages in memory
+    svg_pages = []
+    iwb2svg.extract_iwb_to_svg(
+        iwb_path,
+        None,
+        fix_fills=fix_fills,
+        fix_size=fix_size,
+        images_mode="data_uri",
+        delete_background=delete_background,
+        jobs=jobs,
+        sink=lambda idx, svg_data: svg_pages.append(svg_data),
+    )
+    
+    logger.debug(f"Converting SVGs to PDF: {output_pdf}")
+    
+    # Combine SVGs to PDF
+    combine_svg_pages_to_pdf(svg_pages, output_pdf, uniform_size=uniform_size, use_inkscape=use_inkscape, jobs=jobs, inkscape_path=inkscape_path)
     
     logger.info(f"Successfully created PDF: {output_pdf}")
 
 
 def main():
+    multiprocessing.freeze_support()
     parser = argparse.ArgumentParser(
         description="Convert IWB files to PDF format."
     )
@@ -171,6 +198,19 @@ def main():
         action="store_false",
         help="Use svglib for SVG to PDF conversion (default if Inkscape not available)",
     )
+    parser.add_argument(
+        "--inkscape-path",
+        dest="inkscape_path",
+        default=None,
+        help="Path to the Inkscape executable (default: search PATH and common install locations)",
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes used to convert pages (default: number of CPUs, 1 disables parallelism)",
+    )
 
     parser.set_defaults(fix_fills=True, fix_size=True, delete_background=False, uniform_size=False, use_inkscape=None)
     args = parser.parse_args()
@@ -188,6 +228,8 @@ def main():
             delete_background=args.delete_background,
             uniform_size=args.uniform_size,
             use_inkscape=args.use_inkscape,
+            jobs=args.jobs,
+            inkscape_path=args.inkscape_path,
         )
     except Exception as e:
         logger.error(f"Failed to convert IWB to PDF: {e}", exc_info=True)
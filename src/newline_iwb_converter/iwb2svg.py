@@ -6,81 +6,137 @@ import zipfile
 import os
 import sys
 import argparse
-import xml.etree.ElementTree as ET
-import base64
+import binascii
+import functools
 import re
+import shutil
 import logging
+import multiprocessing
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, repeat
 from pathlib import Path
+from lxml import etree as ET
 from newline_iwb_converter import __version__, configure_logging
+from newline_iwb_converter.concurrency import map_bounded
+
+# pybase64 (optional) encodes with SIMD; fall back to the stdlib C encoder
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    _b64encode = functools.partial(binascii.b2a_base64, newline=False)
 
 logger = logging.getLogger("newline_iwb_converter.iwb2svg")
 
 SVG_NS = "http://www.w3.org/2000/svg"
 XLINK_NS = "http://www.w3.org/1999/xlink"
 
-ET.register_namespace("svg", SVG_NS)
-ET.register_namespace("xlink", XLINK_NS)
-ET.register_namespace("", "http://www.imsglobal.org/xsd/iwb_v1p0")
+# Prefixes declared on every generated SVG root, so libxml2 serializes
+# canonical svg:/xlink: prefixes without touching global namespace state
+_NSMAP = {"svg": SVG_NS, "xlink": XLINK_NS}
+
+# huge_tree lifts libxml2's safety limits on text node size, which long
+# path/points attributes of freehand strokes can exceed
+_XML_PARSER = ET.XMLParser(huge_tree=True)
+
+_NS = {"svg": SVG_NS}
+
+_PAGE_TAG = f"{{{SVG_NS}}}page"
+_XLINK_HREF = f"{{{XLINK_NS}}}href"
+_find_images = ET.XPath("descendant::svg:image", namespaces=_NS)
+
+# Shape elements that get fill:none when they declare no fill of their own
+_SHAPE_TAGS = frozenset({
+    "path",
+    "rect",
+    "circle",
+    "ellipse",
+    "polygon",
+    "polyline",
+    "line",
+    "text",
+})
+_SHAPE_QTAGS = frozenset(f"{{{SVG_NS}}}{tag}" for tag in _SHAPE_TAGS)
+
+# Elements remove_fills may touch: shapes, plus anything carrying a fill
+# attribute or a style. Selecting them in libxml2 skips everything else.
+_find_fill_targets = ET.XPath(
+    "descendant-or-self::*["
+    + " or ".join(f"self::svg:{tag}" for tag in sorted(_SHAPE_TAGS))
+    + " or @fill or @style]",
+    namespaces=_NS,
+)
+
+# Matched by local name in any namespace, like their tbreak/tspan children
+_find_textareas = ET.XPath("descendant-or-self::*[local-name()='textarea']")
+
+_find_background_images = ET.XPath(
+    "descendant::svg:image[starts-with(@id, 'backgroundImage')]",
+    namespaces=_NS,
+)
+
+_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+}
+
+# Multiple of 3 so every chunk encodes to base64 without padding
+_BASE64_CHUNK_SIZE = 3 << 18
+
+_COPY_BUFFER_SIZE = 1 << 20
+
+# Elements whose id starts with one of these keep their fill
+_FILL_KEEP_ID_PREFIXES = ("Autoshape", "Word", "backgroundColor")
+
+# A "fill" declaration (not fill-opacity/fill-rule) inside a style attribute
+_STYLE_FILL_RE = re.compile(r"(^|;)\s*fill\s*:[^;]*")
+
+# Numbers in path data, plain numeric attribute values and translate(x, y)
+# in transform attributes, used by fix_svg_size
+_PATH_NUM_RE = re.compile(r"-?\d+\.?\d*")
+_FLOAT_RE = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*")
+_TRANSLATE_RE = re.compile(r"translate\s*\(\s*([+-]?\d+\.?\d*)\s*[,\s]\s*([+-]?\d+\.?\d*)\s*\)")
 
 
 def remove_fills(svg_root):
     # Set fill="none" or rewrite style fill to none for all shape elements.
     # Skip elements with id starting with "Autoshape" or "Word"
-    shape_tags = {
-        "path",
-        "rect",
-        "circle",
-        "ellipse",
-        "polygon",
-        "polyline",
-        "line",
-        "text",
-    }
-    for elem in svg_root.iter():
-        # ensure we work with local tag name (ignore namespace)
-        tag = elem.tag
-        if not isinstance(tag, str):
-            continue
-        local = tag.split("}")[-1]
+    for elem in _find_fill_targets(svg_root):
+        attrib = elem.attrib
 
-        # Skip elements with id starting with "Autoshape" or "Word"
-        elem_id = elem.get("id", "")
-        if elem_id.startswith("Autoshape") or elem_id.startswith("Word"):
+        # Skip elements with id starting with "Autoshape", "Word" or "backgroundColor"
+        if attrib.get("id", "").startswith(_FILL_KEEP_ID_PREFIXES):
             continue
 
         # If explicit presentation attribute exists, set it to none
-        # Skip elements with id starting with "backgroundColor"
-        if elem_id.startswith("backgroundColor"):
+        has_fill_attr = "fill" in attrib
+        style = attrib.get("style")
+
+        # Common case: a plain shape with neither a fill attribute nor a style
+        if not has_fill_attr and not style:
+            if elem.tag in _SHAPE_QTAGS:
+                attrib["fill"] = "none"
             continue
-        if "fill" in elem.attrib:
-            elem.set("fill", "none")
+
+        if has_fill_attr:
+            attrib["fill"] = "none"
 
         # Handle style attribute (e.g. "style:fill:#000000;stroke:...")
-        style = elem.get("style")
         if style:
-            parts = [p for p in style.split(";") if p.strip()]
-            out_parts = []
-            has_fill = False
-            for p in parts:
-                if ":" not in p:
-                    continue
-                k, v = p.split(":", 1)
-                k = k.strip()
-                v = v.strip()
-                if k == "fill":
-                    out_parts.append("fill:none")
-                    has_fill = True
-                else:
-                    out_parts.append(f"{k}:{v}")
+            # Most styles carry no fill at all; only run the regex when one may be present
+            if "fill" in style:
+                new_style, fill_count = _STYLE_FILL_RE.subn(r"\1fill:none", style)
+            else:
+                new_style, fill_count = style, 0
             # If there was no fill declaration but the element is a shape, add fill:none
-            if not has_fill and local in shape_tags:
-                out_parts.append("fill:none")
-            if out_parts:
-                elem.set("style", ";".join(out_parts))
-
-        # If there was neither a fill attribute nor a style and this is a shape, set fill attribute
-        if "fill" not in elem.attrib and not elem.get("style") and local in shape_tags:
-            elem.set("fill", "none")
+            if not fill_count and elem.tag in _SHAPE_QTAGS:
+                new_style = new_style.strip("; ")
+                new_style = f"{new_style};fill:none" if new_style else "fill:none"
+            if new_style != style:
+                attrib["style"] = new_style
 
 
 def convert_textarea_to_text(svg_root):
@@ -88,42 +144,30 @@ def convert_textarea_to_text(svg_root):
     Convert textarea elements to text elements, preserving all attributes and children.
     Replace tbreak elements with tspan elements that have proper line spacing (dy="1.2em").
     """
-    # Find all textarea elements
-    textareas = []
-    for elem in svg_root.iter():
-        tag = elem.tag
-        if isinstance(tag, str) and tag.endswith("textarea"):
-            textareas.append(elem)
-    
     # Convert each textarea to text
-    for textarea in textareas:
+    for textarea in _find_textareas(svg_root):
         # Create new text element with same attributes
         text_elem = ET.Element(f"{{{SVG_NS}}}text", attrib=textarea.attrib)
         
         # Get the x coordinate for line breaks (from parent text element)
         text_x = textarea.attrib.get("x", "0")
         
-        # Process children, replacing tbreak elements with properly spaced tspan elements
+        # Process children, replacing tbreak elements with properly spaced tspan elements.
+        # lxml's child iterator tolerates the children being moved to text_elem.
+        has_preceding_tbreak = False
         for child in textarea:
             tag = child.tag
-            if isinstance(tag, str) and tag.endswith("tbreak"):
+            local_name = tag.rpartition("}")[2] if isinstance(tag, str) else None
+            if local_name == "tbreak":
                 # Skip tbreak elements - they will be handled by the following tspan
+                has_preceding_tbreak = True
                 continue
             
-            # Check if this tspan is preceded by a tbreak
-            child_index = list(textarea).index(child)
-            has_preceding_tbreak = False
-            if child_index > 0:
-                prev_sibling = textarea[child_index - 1]
-                prev_tag = prev_sibling.tag
-                if isinstance(prev_tag, str) and prev_tag.endswith("tbreak"):
-                    has_preceding_tbreak = True
-            
             # Copy the child element
             new_child = child
             if has_preceding_tbreak:
                 # Add line break attributes to tspan that follows tbreak
-                if isinstance(tag, str) and tag.endswith("tspan"):
+                if local_name == "tspan":
                     # Create a copy to modify
                     new_child = ET.Element(tag, attrib=child.attrib)
                     # Add x coordinate and line spacing
@@ -135,6 +179,7 @@ def convert_textarea_to_text(svg_root):
                     # Copy all children
                     for grandchild in child:
                         new_child.append(grandchild)
+                has_preceding_tbreak = False
             
             text_elem.append(new_child)
         
@@ -145,26 +190,18 @@ def convert_textarea_to_text(svg_root):
             text_elem.tail = textarea.tail
         
         # Replace textarea with text in parent
-        parent = svg_root.find(".//" + textarea.tag + "/..")
+        parent = textarea.getparent()
         if parent is not None:
-            index = list(parent).index(textarea)
-            parent[index] = text_elem
-        else:
-            # If not found as child, search more thoroughly
-            for elem in svg_root.iter():
-                if textarea in list(elem):
-                    index = list(elem).index(textarea)
-                    elem[index] = text_elem
-                    break
+            parent.replace(textarea, text_elem)
 
 
 def parse_transform_translate(transform_str):
     """Extract translate(x, y) from a transform attribute string."""
-    if not transform_str:
+    if not transform_str or "translate" not in transform_str:
         return 0.0, 0.0
     
     # Look for translate(...) pattern
-    match = re.search(r'translate\s*\(\s*([+-]?\d+\.?\d*)\s*[,\s]\s*([+-]?\d+\.?\d*)\s*\)', transform_str)
+    match = _TRANSLATE_RE.search(transform_str)
     if match:
         try:
             tx = float(match.group(1))
@@ -176,11 +213,126 @@ def parse_transform_translate(transform_str):
     return 0.0, 0.0
 
 
+def _max_coordinates(values):
+    """
+    Get the largest x and y of a flat "x1, y1, x2, y2, ..." sequence of numeric strings.
+
+    A trailing unpaired value is ignored. The reductions run over slices with
+    map/max, so no Python-level loop is spent per coordinate.
+
+    Returns:
+        (max_x, max_y), or None if the sequence holds no complete pair
+    """
+    count = len(values) // 2 * 2
+    if not count:
+        return None
+    return max(map(float, values[0:count:2])), max(map(float, values[1:count:2]))
+
+
+def _parse_number(value, default=0.0):
+    """Convert an attribute value to float: default if it is missing, None if it is malformed."""
+    if value is None:
+        return default
+    return float(value) if _FLOAT_RE.fullmatch(value) else None
+
+
+def _box_extent(elem, tx, ty):
+    """Get the bottom-right corner of a rect or image element, or None if it is malformed."""
+    x, y, w, h = (_parse_number(elem.get(name)) for name in ("x", "y", "width", "height"))
+    if x is None or y is None or w is None or h is None:
+        return None
+    return x + tx + w, y + ty + h
+
+
+def _circle_extent(elem, tx, ty):
+    """Get the bottom-right corner of a circle element, or None if it is malformed."""
+    cx, cy, r = (_parse_number(elem.get(name)) for name in ("cx", "cy", "r"))
+    if cx is None or cy is None or r is None:
+        return None
+    return cx + tx + r, cy + ty + r
+
+
+def _ellipse_extent(elem, tx, ty):
+    """Get the bottom-right corner of an ellipse element, or None if it is malformed."""
+    cx, cy, rx, ry = (_parse_number(elem.get(name)) for name in ("cx", "cy", "rx", "ry"))
+    if cx is None or cy is None or rx is None or ry is None:
+        return None
+    return cx + tx + rx, cy + ty + ry
+
+
+def _points_extent(elem, tx, ty):
+    """Get the largest point of a polyline or polygon element, or None if it has none."""
+    points_str = elem.get("points", "")
+    if not points_str:
+        return None
+    try:
+        # Points format: "x1,y1 x2,y2 x3,y3 ..."
+        extent = _max_coordinates(points_str.replace(",", " ").split())
+    except (ValueError, TypeError):
+        return None
+    if extent is None:
+        return None
+    return extent[0] + tx, extent[1] + ty
+
+
+def _path_extent(elem, tx, ty):
+    """Get the largest coordinate pair of a path element (basic parsing), or None if it has none."""
+    d_str = elem.get("d", "")
+    if not d_str:
+        return None
+    # Simple extraction of all numbers from path data
+    extent = _max_coordinates(_PATH_NUM_RE.findall(d_str))
+    if extent is None:
+        return None
+    return extent[0] + tx, extent[1] + ty
+
+
+# Extent function of each measured element, by local name. Extent functions
+# take the element and the translation applied to it (its own transform and
+# those of its ancestors).
+_EXTENT_FUNCS = {
+    "rect": _box_extent,
+    "image": _box_extent,
+    "circle": _circle_extent,
+    "ellipse": _ellipse_extent,
+    "polyline": _points_extent,
+    "polygon": _points_extent,
+    "path": _path_extent,
+}
+
+
+def _content_extents(svg_root):
+    """
+    Yield the bottom-right corner of every measurable element under svg_root.
+
+    The tree is walked once with a stack of (element, tx, ty), so each
+    transform is parsed a single time and its translation is passed down to
+    the element's children.
+    """
+    stack = [(svg_root, 0.0, 0.0)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        elem, tx, ty = pop()
+        transform = elem.get("transform")
+        if transform:
+            dx, dy = parse_transform_translate(transform)
+            tx += dx
+            ty += dy
+        measure = _EXTENT_FUNCS.get(elem.tag.rpartition("}")[2])
+        if measure is not None:
+            extent = measure(elem, tx, ty)
+            if extent is not None:
+                yield extent
+        for child in elem.iterchildren(ET.Element):
+            push((child, tx, ty))
+
+
 def fix_svg_size(svg_root, margin=100):
     """
     Fix SVG size if width or height are smaller than the actual content.
     Calculate bounding box of all elements and expand SVG if needed.
-    Takes into account transform attributes (especially translate).
+    Takes into account transform attributes (especially translate),
+    including those inherited from enclosing groups.
     
     Args:
         svg_root: The SVG root element
@@ -193,104 +345,18 @@ def fix_svg_size(svg_root, margin=100):
         height_str = svg_root.get("height", "100%")
         
         # Parse numeric values (ignore percentages)
-        width = float(width_str) if width_str and width_str.replace(".", "").isdigit() else None
-        height = float(height_str) if height_str and height_str.replace(".", "").isdigit() else None
+        width = float(width_str) if _FLOAT_RE.fullmatch(width_str) else None
+        height = float(height_str) if _FLOAT_RE.fullmatch(height_str) else None
         
         if width is None or height is None:
             return  # Can't fix if dimensions are percentages or invalid
         
-        # Find bounding box of all elements with position/size attributes
-        max_x = 0.0
-        max_y = 0.0
-        
-        for elem in svg_root.iter():
-            tag = elem.tag
-            if not isinstance(tag, str):
-                continue
-            local = tag.split("}")[-1]
-            
-            # Get transform offset if present
-            transform = elem.get("transform", "")
-            tx, ty = parse_transform_translate(transform)
-            
-            # For rect elements
-            if local == "rect":
-                try:
-                    x = float(elem.get("x", 0)) + tx
-                    y = float(elem.get("y", 0)) + ty
-                    w = float(elem.get("width", 0))
-                    h = float(elem.get("height", 0))
-                    max_x = max(max_x, x + w)
-                    max_y = max(max_y, y + h)
-                except (ValueError, TypeError):
-                    pass
-            
-            # For circle elements
-            elif local == "circle":
-                try:
-                    cx = float(elem.get("cx", 0)) + tx
-                    cy = float(elem.get("cy", 0)) + ty
-                    r = float(elem.get("r", 0))
-                    max_x = max(max_x, cx + r)
-                    max_y = max(max_y, cy + r)
-                except (ValueError, TypeError):
-                    pass
-            
-            # For ellipse elements
-            elif local == "ellipse":
-                try:
-                    cx = float(elem.get("cx", 0)) + tx
-                    cy = float(elem.get("cy", 0)) + ty
-                    rx = float(elem.get("rx", 0))
-                    ry = float(elem.get("ry", 0))
-                    max_x = max(max_x, cx + rx)
-                    max_y = max(max_y, cy + ry)
-                except (ValueError, TypeError):
-                    pass
-            
-            # For polyline and polygon - parse points attribute
-            elif local in ("polyline", "polygon"):
-                try:
-                    points_str = elem.get("points", "")
-                    if points_str:
-                        # Points format: "x1,y1 x2,y2 x3,y3 ..."
-                        points = points_str.replace(",", " ").split()
-                        for i in range(0, len(points), 2):
-                            if i + 1 < len(points):
-                                x = float(points[i]) + tx
-                                y = float(points[i + 1]) + ty
-                                max_x = max(max_x, x)
-                                max_y = max(max_y, y)
-                except (ValueError, TypeError, IndexError):
-                    pass
-            
-            # For image elements
-            elif local == "image":
-                try:
-                    x = float(elem.get("x", 0)) + tx
-                    y = float(elem.get("y", 0)) + ty
-                    w = float(elem.get("width", 0))
-                    h = float(elem.get("height", 0))
-                    max_x = max(max_x, x + w)
-                    max_y = max(max_y, y + h)
-                except (ValueError, TypeError):
-                    pass
-            
-            # For path elements - extract coordinates from d attribute (basic parsing)
-            elif local == "path":
-                try:
-                    d_str = elem.get("d", "")
-                    if d_str:
-                        # Simple extraction of all numbers from path data
-                        numbers = re.findall(r"-?\d+\.?\d*", d_str)
-                        for i in range(0, len(numbers), 2):
-                            if i + 1 < len(numbers):
-                                x = float(numbers[i]) + tx
-                                y = float(numbers[i + 1]) + ty
-                                max_x = max(max_x, x)
-                                max_y = max(max_y, y)
-                except (ValueError, TypeError, IndexError):
-                    pass
+        # Find bounding box of all elements with position/size attributes.
+        # The extents are reduced once at the end instead of comparing
+        # element by element.
+        extents = list(_content_extents(svg_root))
+        max_x = max(0.0, max((x for x, _ in extents), default=0.0))
+        max_y = max(0.0, max((y for _, y in extents), default=0.0))
         
         # If content extends beyond current size, expand SVG with safety margin
         if max_x > width or max_y > height:
@@ -307,178 +373,399 @@ def fix_svg_size(svg_root, margin=100):
 def delete_background_images(svg_root):
     """Remove image elements with id starting with 'backgroundImage'."""
     removed_count = 0
-    for img_elem in svg_root.findall(".//svg:image", {"svg": SVG_NS}):
-        elem_id = img_elem.get("id")
-        if elem_id and elem_id.startswith("backgroundImage"):
-            # Find parent and remove the image element
-            for parent in svg_root.iter():
-                if img_elem in list(parent):
-                    parent.remove(img_elem)
-                    removed_count += 1
-                    logger.debug(f"Removed background image: {elem_id}")
-                    break
+    for img_elem in _find_background_images(svg_root):
+        img_elem.getparent().remove(img_elem)
+        removed_count += 1
+        logger.debug(f"Removed background image: {img_elem.get('id')}")
     if removed_count > 0:
         logger.info(f"Removed {removed_count} background image(s)")
 
 
-def fix_compressed_unexistent_images(svg_root, zip_file):
-    """Fix xlink:href for compressed images that do not exist in the zip."""
+def _fix_compressed_image(img_elem, zip_names):
+    """Point an image at its compressed copy if the original is missing. Returns True if fixed."""
+    href = img_elem.get(_XLINK_HREF)
+    if href and href.startswith("images/") and href.endswith(".png") and href not in zip_names:
+        # Image does not exist, try compressed version
+        compressed_href = href.replace("images/", "images/compressed_")
+        logger.debug(f"Fixing missing image href: {href} -> {compressed_href}")
+        if compressed_href in zip_names:
+            img_elem.set(_XLINK_HREF, compressed_href)
+            return True
+        logger.warning(f"Image not found in IWB (neither original nor compressed): {href}")
+    return False
+
+
+def fix_compressed_unexistent_images(svg_root, zip_file, zip_names=None):
+    """
+    Fix xlink:href for compressed images that do not exist in the zip.
+
+    Args:
+        svg_root: The SVG root element
+        zip_file: Open ZipFile of the IWB
+        zip_names: Optional set of the zip's entry names, computed once per IWB
+    """
+    if zip_names is None:
+        zip_names = frozenset(zip_file.namelist())
     fixed_count = 0
-    for img_elem in svg_root.findall(".//svg:image", {"svg": SVG_NS}):
-        href = img_elem.get(f"{{{XLINK_NS}}}href")
-        if href and href.startswith("images/") and href.endswith(".png"):
-            try:
-                zip_file.getinfo(href)
-            except KeyError:
-                # Image does not exist, try compressed version
-                compressed_href = href.replace("images/", "images/compressed_")
-                logger.debug(f"Fixing missing image href: {href} -> {compressed_href}")
-                try:
-                    zip_file.getinfo(compressed_href)
-                    img_elem.set(f"{{{XLINK_NS}}}href", compressed_href)
-                    fixed_count += 1
-                except KeyError:
-                    logger.warning(f"Image not found in IWB (neither original nor compressed): {href}")
+    for img_elem in _find_images(svg_root):
+        if _fix_compressed_image(img_elem, zip_names):
+            fixed_count += 1
     if fixed_count > 0:
         logger.debug(f"Fixed {fixed_count} missing image reference(s)")
 
 
-def process_images_data_uri(svg_root, zip_file):
-    """Convert image xlink:href to data URIs from the zip file."""
+def zip_entry_to_data_uri(zip_file, name, mime_type):
+    """
+    Base64-encode a zip entry into a data URI.
+
+    The entry is decompressed and encoded in chunks straight into a buffer
+    sized for the final URI, so the raw image bytes are never held in full.
+
+    Raises:
+        KeyError: If the entry does not exist in the zip file
+    """
+    info = zip_file.getinfo(name)
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    buffer = bytearray(len(prefix) + 4 * ((info.file_size + 2) // 3))
+    buffer[:len(prefix)] = prefix
+    pos = len(prefix)
+    with zip_file.open(info) as source:
+        while chunk := source.read(_BASE64_CHUNK_SIZE):
+            encoded = _b64encode(chunk)
+            buffer[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+    del buffer[pos:]
+    return buffer.decode("ascii")
+
+
+def _embed_image(img_elem, zip_file, uri_cache, max_size=None):
+    """Replace an image's zip href with a data URI. Returns True if converted."""
+    href = img_elem.get(_XLINK_HREF)
+    if not (href and href.startswith("images/")):
+        return False
+    data_uri = uri_cache.get(href)
+    if data_uri is None:
+        try:
+            if max_size is not None and zip_file.getinfo(href).file_size > max_size:
+                logger.debug(f"Keeping large image as file reference: {href}")
+                return False
+
+            # Determine MIME type from file extension
+            ext = Path(href).suffix.lower()
+            mime_type = _MIME_TYPES.get(ext, "application/octet-stream")
+            
+            # Create data URI
+            data_uri = zip_entry_to_data_uri(zip_file, href, mime_type)
+            # Most images are used once: only keep the data URI of those seen
+            # before, instead of holding every image of the deck in memory
+            uri_cache[href] = data_uri if href in uri_cache else None
+            logger.debug(f"Converted image to data URI: {href} ({zip_file.getinfo(href).file_size} bytes)")
+        except KeyError:
+            logger.warning(f"Image file not found in IWB: {href}")
+            return False
+    else:
+        logger.debug(f"Reused cached data URI: {href}")
+    img_elem.set(_XLINK_HREF, data_uri)
+    return True
+
+
+def process_images_data_uri(svg_root, zip_file, uri_cache=None, max_size=None):
+    """
+    Convert image xlink:href to data URIs from the zip file.
+    
+    Args:
+        svg_root: The SVG root element
+        zip_file: Open ZipFile of the IWB
+        uri_cache: Optional dict mapping zip entry names to data URIs (None for
+                   images seen once). Pass the same dict for every page so images
+                   shared across pages aren't encoded for every use.
+        max_size: Images larger than this many bytes keep their relative href
+                  instead of being embedded. If None, every image is embedded.
+    """
+    if uri_cache is None:
+        uri_cache = {}
     converted_count = 0
-    for img_elem in svg_root.findall(".//svg:image", {"svg": SVG_NS}):
-        href = img_elem.get(f"{{{XLINK_NS}}}href")
-        if href and href.startswith("images/"):
-            try:
-                image_data = zip_file.read(href)
-                # Determine MIME type from file extension
-                ext = Path(href).suffix.lower()
-                mime_types = {
-                    ".png": "image/png",
-                    ".jpg": "image/jpeg",
-                    ".jpeg": "image/jpeg",
-                    ".gif": "image/gif",
-                    ".svg": "image/svg+xml",
-                }
-                mime_type = mime_types.get(ext, "application/octet-stream")
-                
-                # Create data URI
-                b64_data = base64.b64encode(image_data).decode("utf-8")
-                data_uri = f"data:{mime_type};base64,{b64_data}"
-                img_elem.set(f"{{{XLINK_NS}}}href", data_uri)
-                converted_count += 1
-                logger.debug(f"Converted image to data URI: {href} ({len(image_data)} bytes)")
-            except KeyError:
-                logger.warning(f"Image file not found in IWB: {href}")
+    for img_elem in _find_images(svg_root):
+        if _embed_image(img_elem, zip_file, uri_cache, max_size):
+            converted_count += 1
+    if converted_count > 0:
+        logger.debug(f"Converted {converted_count} image(s) to data URIs")
+
+
+def _process_page_images(svg_root, zip_file, zip_names, images_mode, delete_background, uri_cache, data_uri_max_size=None):
+    """
+    Apply every image transform of a page in a single pass over its image elements.
+
+    Background images are dropped before anything else is done to them, so they
+    are never base64-encoded only to be removed afterwards.
+    """
+    if uri_cache is None:
+        uri_cache = {}
+    removed_count = fixed_count = converted_count = 0
+    for img_elem in _find_images(svg_root):
+        if delete_background and img_elem.get("id", "").startswith("backgroundImage"):
+            img_elem.getparent().remove(img_elem)
+            removed_count += 1
+            logger.debug(f"Removed background image: {img_elem.get('id')}")
+            continue
+        if _fix_compressed_image(img_elem, zip_names):
+            fixed_count += 1
+        if images_mode == "data_uri" and _embed_image(img_elem, zip_file, uri_cache, data_uri_max_size):
+            converted_count += 1
+    if fixed_count > 0:
+        logger.debug(f"Fixed {fixed_count} missing image reference(s)")
     if converted_count > 0:
         logger.debug(f"Converted {converted_count} image(s) to data URIs")
+    if removed_count > 0:
+        logger.info(f"Removed {removed_count} background image(s)")
 
 
-def process_images_copy_directory(svg_root, zip_file, output_dir):
-    """Copy the images directory from the IWB file to the output directory."""
-    # Extract all images from the zip
+def process_images_copy_directory(svg_root, zip_file, output_dir, min_size=None):
+    """
+    Copy the images directory from the IWB file to the output directory.
+
+    If min_size is given, only images larger than that many bytes are copied.
+    """
+    # Directory entries (e.g. "images/") carry no data; only their path is needed
+    image_infos = [
+        info for info in zip_file.infolist()
+        if info.filename.startswith("images/") and not info.is_dir()
+        and (min_size is None or info.file_size > min_size)
+    ]
+
+    # Create every target directory once up front
+    target_dirs = {os.path.dirname(os.path.join(output_dir, info.filename)) for info in image_infos}
+    for target_dir in target_dirs:
+        os.makedirs(target_dir, exist_ok=True)
+
+    # Extract all images from the zip, streaming them in bounded chunks
     copied_count = 0
-    for name in zip_file.namelist():
-        if name.startswith("images/"):
-            target_path = os.path.join(output_dir, name)
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            with zip_file.open(name) as source:
-                with open(target_path, "wb") as target:
-                    target.write(source.read())
-            copied_count += 1
-            logger.debug(f"Copied image: {name}")
+    for info in image_infos:
+        name = info.filename
+        target_path = os.path.join(output_dir, name)
+        with zip_file.open(info) as source, open(target_path, "wb") as target:
+            shutil.copyfileobj(source, target, _COPY_BUFFER_SIZE)
+        copied_count += 1
+        logger.debug(f"Copied image: {name}")
     if copied_count > 0:
         logger.info(f"Copied {copied_count} image file(s) to {output_dir}")
 
 
-def extract_iwb_to_svg(iwb_path, output_dir, fix_fills=True, fix_size=True, images_mode="data_uri", delete_background=False):
+def page_to_svg(page, zip_file, fix_fills=True, fix_size=True, images_mode="data_uri", delete_background=False, uri_cache=None, data_uri_max_size=None, zip_names=None):
+    """
+    Build a standalone SVG document from an IWB page element.
+    
+    The children of the page are moved into the new SVG root.
+    
+    Args:
+        page: The <svg:page> element
+        zip_file: Open ZipFile of the IWB, used to resolve images
+        fix_fills: Whether to remove fills from shapes
+        fix_size: Whether to fix SVG size if content extends beyond dimensions
+        images_mode: How to handle images - "nothing", "copy_directory", or "data_uri"
+        delete_background: Whether to remove background image elements
+        uri_cache: Optional dict of data URIs shared between pages (see process_images_data_uri)
+        data_uri_max_size: In "data_uri" mode, images larger than this many bytes
+                           keep their relative href. If None, every image is embedded.
+        zip_names: Optional set of the zip's entry names. Pass the same set for every
+                   page so image existence checks don't rebuild it.
+    
+    Returns:
+        The SVG document serialized as UTF-8 bytes
+    """
+    attribs = {
+        "version": "1.1",
+        "width": page.attrib.get("width", "100%"),
+        "height": page.attrib.get("height", "100%"),
+    }
+
+    svg_root = ET.Element(f"{{{SVG_NS}}}svg", attrib=attribs, nsmap=_NSMAP)
+
+    # Move page content (lxml's child iterator tolerates the children being moved away)
+    svg_root.extend(page)
+
+    # ---- PROCESS AND DELETE BACKGROUND IMAGES ----
+    # For "nothing" mode, leave href as-is
+    # For "copy_directory" mode, leave href as-is (already copied)
+    if zip_names is None:
+        zip_names = frozenset(zip_file.namelist())
+    _process_page_images(svg_root, zip_file, zip_names, images_mode, delete_background, uri_cache, data_uri_max_size)
+
+    # ---- CONVERT TEXTAREA TO TEXT ----
+    convert_textarea_to_text(svg_root)
+
+    # ---- APPLY FIX OPTIONS ----
+    if fix_fills:
+        remove_fills(svg_root)
+    
+    # Percentage sizes (the default when the page has none) cannot be fixed,
+    # so don't measure the content at all
+    if fix_size and not (attribs["width"].endswith("%") or attribs["height"].endswith("%")):
+        fix_svg_size(svg_root)
+
+    return ET.tostring(svg_root, encoding="utf-8", xml_declaration=True)
+
+
+def iter_pages(xml_stream):
+    """
+    Incrementally parse IWB XML and yield each <svg:page> element once it is complete.
+    
+    A page and everything parsed before it is freed as soon as the consumer asks
+    for the next page, so memory stays bounded by roughly one page of DOM.
+    
+    Args:
+        xml_stream: Binary file-like object with the IWB XML
+    """
+    context = ET.iterparse(xml_stream, events=("end",), tag=_PAGE_TAG, huge_tree=True)
+    for _, page in context:
+        yield page
+        page.clear()
+        while page.getprevious() is not None:
+            del page.getparent()[0]
+
+
+# IWB archive, its entry names and data URI cache, set up once per worker process by _init_page_worker
+_worker_zip_file = None
+_worker_zip_names = frozenset()
+_worker_uri_cache = {}
+
+
+def _init_page_worker(iwb_path):
+    global _worker_zip_file, _worker_zip_names
+    _worker_zip_file = zipfile.ZipFile(iwb_path, "r")
+    _worker_zip_names = frozenset(_worker_zip_file.namelist())
+    # Unlike atexit handlers, finalizers also run when a forked worker exits
+    multiprocessing.util.Finalize(None, _worker_zip_file.close, exitpriority=0)
+
+
+def _page_worker(page_xml, options):
+    page = ET.fromstring(page_xml, _XML_PARSER)
+    return page_to_svg(page, _worker_zip_file, uri_cache=_worker_uri_cache, zip_names=_worker_zip_names, **options)
+
+
+def extract_iwb_to_svg(iwb_path, output_dir, fix_fills=True, fix_size=True, images_mode="data_uri", delete_background=False, jobs=None, sink=None, data_uri_max_size=None):
     """
     Extract SVG pages from an IWB file.
     
     Args:
         iwb_path: Path to input .iwb file
-        output_dir: Output directory for SVG files
+        output_dir: Output directory for SVG files (may be None when a sink is given
+                    and images_mode is not "copy_directory")
         fix_fills: Whether to remove fills from shapes
         fix_size: Whether to fix SVG size if content extends beyond dimensions
         images_mode: How to handle images - "nothing", "copy_directory", or "data_uri"
         delete_background: Whether to remove background image elements
+        jobs: Number of worker processes used to convert pages.
+              If None, use one per CPU. 1 converts pages sequentially.
+        sink: Callable receiving (page_index, svg_bytes) for each page, in page order.
+              If None, pages are written to output_dir as page_<index>.svg.
+        data_uri_max_size: In "data_uri" mode, images larger than this many bytes are
+                           copied to output_dir and referenced by relative path
+                           instead of being embedded. If None, or if output_dir is
+                           None, every image is embedded.
     """
-    logger.info(f"Extracting IWB to SVG: {iwb_path} -> {output_dir}")
+    logger.info(f"Extracting IWB to SVG: {iwb_path} -> {output_dir if output_dir is not None else 'memory'}")
     
-    if not os.path.exists(output_dir):
+    if output_dir is not None and not os.path.exists(output_dir):
         os.makedirs(output_dir)
         logger.debug(f"Created output directory: {output_dir}")
 
+    if sink is None:
+        sink = functools.partial(_write_svg_page, output_dir)
+
+    if data_uri_max_size is not None and output_dir is None:
+        # Without an output directory there is nowhere to copy large images to,
+        # and their relative references would point at nothing
+        logger.warning("No output directory to copy large images to, embedding every image")
+        data_uri_max_size = None
+
     with zipfile.ZipFile(iwb_path, "r") as z:
-        xml_name = None
-        for name in z.namelist():
-            if name.lower().endswith(".xml"):
-                xml_name = name
-                break
+        xml_name = next(
+            (info.filename for info in z.infolist() if info.filename.lower().endswith(".xml")),
+            None,
+        )
 
         if xml_name is None:
             logger.error("No XML file found in IWB")
             sys.exit(1)
 
         logger.debug(f"Found XML file in IWB: {xml_name}")
-        xml_data = z.read(xml_name)
-        root = ET.fromstring(xml_data)
-
-        ns = {"svg": SVG_NS}
-        pages = root.findall(".//svg:page", ns)
 
-        if not pages:
+        # Handle images directory copy first if needed
+        if images_mode == "copy_directory":
+            process_images_copy_directory(None, z, output_dir)
+        elif images_mode == "data_uri" and data_uri_max_size is not None:
+            # Images too large to embed are referenced next to the SVG files instead
+            process_images_copy_directory(None, z, output_dir, min_size=data_uri_max_size)
+
+        options = {
+            "fix_fills": fix_fills,
+            "fix_size": fix_size,
+            "images_mode": images_mode,
+            "delete_background": delete_background,
+            "data_uri_max_size": data_uri_max_size,
+        }
+
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+
+        page_count = 0
+        with z.open(xml_name) as xml_stream:
+            pages = iter_pages(xml_stream)
+            executor = None
+            if jobs > 1:
+                page_xmls = (ET.tostring(page, with_tail=False) for page in pages)
+                # Starting worker processes isn't worth it for a single page
+                first_page_xmls = list(islice(page_xmls, 2))
+                if len(first_page_xmls) > 1:
+                    try:
+                        executor = ProcessPoolExecutor(
+                            max_workers=jobs,
+                            initializer=_init_page_worker,
+                            initargs=(iwb_path,),
+                        )
+                    except (OSError, NotImplementedError) as e:
+                        logger.warning(f"Could not start worker processes, converting pages sequentially: {e}")
+                if executor is None:
+                    # The pages read ahead may already be freed, parse them back
+                    first_pages = (ET.fromstring(page_xml, _XML_PARSER) for page_xml in first_page_xmls)
+                    pages = chain(first_pages, pages)
+
+            if executor is not None:
+                logger.debug(f"Converting pages with up to {jobs} worker processes")
+                with executor:
+                    # Pages are handed out as workers free up, so the XML is
+                    # still parsed incrementally and results don't pile up
+                    svg_pages = map_bounded(
+                        executor, _page_worker, chain(first_page_xmls, page_xmls), repeat(options),
+                        max_pending=jobs * 2,
+                    )
+                    for idx, svg_data in enumerate(svg_pages):
+                        sink(idx, svg_data)
+                        page_count += 1
+            else:
+                uri_cache = {}
+                zip_names = frozenset(z.namelist())
+                for idx, page in enumerate(pages):
+                    sink(idx, page_to_svg(page, z, uri_cache=uri_cache, zip_names=zip_names, **options))
+                    page_count += 1
+
+        if not page_count:
             logger.error("No <svg:page> elements found in XML")
             sys.exit(1)
-        
-        logger.info(f"Found {len(pages)} page(s) in IWB file")
 
-        # Handle images directory copy first if needed
-        if images_mode == "copy_directory":
-            process_images_copy_directory(root, z, output_dir)
-
-        for idx, page in enumerate(pages):
-            attribs = {
-                "version": "1.1",
-                "width": page.attrib.get("width", "100%"),
-                "height": page.attrib.get("height", "100%"),
-            }
-
-            svg_root = ET.Element(f"{{{SVG_NS}}}svg", attrib=attribs)
-
-            # Copy page content
-            for child in list(page):
-                svg_root.append(child)
-
-            # ---- PROCESS IMAGES ----
-            fix_compressed_unexistent_images(svg_root, z)
-            if images_mode == "data_uri":
-                process_images_data_uri(svg_root, z)
-            # For "nothing" mode, leave href as-is
-            # For "copy_directory" mode, leave href as-is (already copied)
-
-            # ---- DELETE BACKGROUND IMAGES ----
-            if delete_background:
-                delete_background_images(svg_root)
-
-            # ---- CONVERT TEXTAREA TO TEXT ----
-            convert_textarea_to_text(svg_root)
-
-            # ---- APPLY FIX OPTIONS ----
-            if fix_fills:
-                remove_fills(svg_root)
-            
-            if fix_size:
-                fix_svg_size(svg_root)
+        logger.info(f"Extracted {page_count} page(s) from IWB file")
 
-            out_path = os.path.join(output_dir, f"page_{idx}.svg")
-            ET.ElementTree(svg_root).write(
-                out_path, encoding="utf-8", xml_declaration=True
-            )
-            logger.debug(f"Saved: {out_path}")
+
+def _write_svg_page(output_dir, idx, svg_data):
+    out_path = os.path.join(output_dir, f"page_{idx}.svg")
+    with open(out_path, "wb") as f:
+        f.write(svg_data)
+    logger.debug(f"Saved: {out_path}")
 
 
 def main():
+    multiprocessing.freeze_support()
     parser = argparse.ArgumentParser(
         description="Extract SVG pages from an IWB file, with optional fill->stroke repair."
     )
@@ -534,6 +821,22 @@ def main():
         help="Remove background image elements (id starting with 'backgroundImage')",
     )
 
+    parser.add_argument(
+        "--data-uri-max-size",
+        dest="data_uri_max_size",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="With --images data_uri, copy images larger than BYTES to the output directory instead of embedding them",
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes used to convert pages (default: number of CPUs, 1 disables parallelism)",
+    )
+
     parser.set_defaults(fix_fills=True, fix_size=True, delete_background=False)
     args = parser.parse_args()
     
@@ -549,6 +852,8 @@ def main():
             fix_size=args.fix_size,
             images_mode=args.images_mode,
             delete_background=args.delete_background,
+            jobs=args.jobs,
+            data_uri_max_size=args.data_uri_max_size,
         )
         logger.info("SVG extraction completed successfully")
     except Exception as e:
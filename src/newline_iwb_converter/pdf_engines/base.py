@@ -3,10 +3,89 @@
 """Base class for PDF conversion engines."""
 
 import logging
+import os
+import re
+import secrets
+import tempfile
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger("newline_iwb_converter.pdf_engines")
 
+_SVG_PAGE_RE = re.compile(r"page_(\d+)\.svg")
+
+
+def find_svg_pages(svg_dir):
+    """
+    List the SVG pages (page_<number>.svg files) of a directory.
+
+    Args:
+        svg_dir: Directory containing SVG files
+
+    Returns:
+        List of (file name, file path) tuples, sorted by page number.
+        Empty if the directory does not exist.
+    """
+    pages = []
+    try:
+        with os.scandir(svg_dir) as it:
+            for entry in it:
+                match = _SVG_PAGE_RE.fullmatch(entry.name)
+                if match:
+                    pages.append((int(match.group(1)), entry.name, entry.path))
+    except OSError as e:
+        logger.debug(f"Could not list {svg_dir}: {e}")
+        return []
+    pages.sort()
+    return [(name, path) for _, name, path in pages]
+
+
+def load_pdf_writer():
+    """
+    Import the PdfWriter class used to merge PDF pages.
+
+    pypdf is preferred; PyPDF2 (its predecessor, which has the same
+    PdfWriter.append API) is used when only that package is installed.
+
+    Returns:
+        The PdfWriter class
+
+    Raises:
+        ImportError: If neither pypdf nor PyPDF2 is installed
+    """
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        from PyPDF2 import PdfWriter
+    return PdfWriter
+
+
+def write_pdf_file(output_pdf, pdf_data):
+    """
+    Write a PDF document with a single write, replacing the output file atomically.
+
+    The data is written to a uniquely named temporary file next to the output,
+    which is then renamed, so an interrupted run never leaves a truncated PDF
+    behind and concurrent runs don't overwrite each other's temporary files.
+
+    Args:
+        output_pdf: Path to output PDF file
+        pdf_data: The PDF document as bytes
+    """
+    output_pdf = os.fspath(output_pdf)
+    output_dir, output_name = os.path.split(os.path.abspath(output_pdf))
+    temp_pdf = os.path.join(output_dir, f".{output_name}.{secrets.token_hex(8)}.tmp")
+    # Created like any new file, so the PDF gets the usual permissions, and
+    # exclusively, so a file of another run is never written to
+    fd = os.open(temp_pdf, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with open(fd, "wb") as f:
+            f.write(pdf_data)
+        os.replace(temp_pdf, output_pdf)
+    except BaseException:
+        if os.path.exists(temp_pdf):
+            os.remove(temp_pdf)
+        raise
+
 
 class BasePDFEngine(ABC):
     """Abstract base class for PDF conversion engines."""
@@ -23,6 +102,26 @@ class BasePDFEngine(ABC):
         """
         pass
 
+    def combine_svg_bytes_to_pdf(self, svg_pages, output_pdf, **kwargs):
+        """
+        Combine in-memory SVG documents into a single PDF.
+
+        The default implementation writes the pages to a temporary directory
+        and calls combine_svgs_to_pdf; engines that can read SVG data directly
+        should override it.
+
+        Args:
+            svg_pages: SVG documents as bytes, in page order
+            output_pdf: Path to output PDF file
+            **kwargs: Engine-specific options
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logger.debug(f"Writing {len(svg_pages)} SVG page(s) to temporary directory: {temp_dir}")
+            for idx, svg_data in enumerate(svg_pages):
+                with open(os.path.join(temp_dir, f"page_{idx}.svg"), "wb") as f:
+                    f.write(svg_data)
+            self.combine_svgs_to_pdf(temp_dir, output_pdf, **kwargs)
+
     @abstractmethod
     def is_available(self):
         """
@@ -2,77 +2,117 @@
 
 """Inkscape PDF conversion engine."""
 
+import functools
+import io
+import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from newline_iwb_converter.pdf_engines.base import BasePDFEngine
+from newline_iwb_converter.pdf_engines.base import BasePDFEngine, find_svg_pages, load_pdf_writer, write_pdf_file
 
 logger = logging.getLogger("newline_iwb_converter.pdf_engines.inkscape")
 
+# First version whose --shell mode understands the export/file-close actions
+SHELL_MIN_VERSION = (1, 2)
+
+# Characters that end an action in an Inkscape --shell command line, which
+# has no way of quoting them
+_SHELL_UNSAFE_CHARS = frozenset(";\r\n")
+
+
+# Common installation paths for the current operating system
+if sys.platform == "win32":
+    _COMMON_INKSCAPE_PATHS = (
+        r"C:\Program Files\Inkscape\bin\inkscape.exe",
+        r"C:\Program Files (x86)\Inkscape\bin\inkscape.exe",
+        r"C:\Program Files\Inkscape\inkscape.exe",
+        r"C:\Program Files (x86)\Inkscape\inkscape.exe",
+    )
+elif sys.platform == "darwin":
+    _COMMON_INKSCAPE_PATHS = (
+        "/Applications/Inkscape.app/Contents/MacOS/inkscape",
+        "/usr/local/bin/inkscape",
+        "/opt/homebrew/bin/inkscape",
+    )
+elif sys.platform == "linux":
+    _COMMON_INKSCAPE_PATHS = (
+        "/usr/bin/inkscape",
+        "/usr/local/bin/inkscape",
+        "/snap/bin/inkscape",
+    )
+else:
+    _COMMON_INKSCAPE_PATHS = ()
+
+
+@functools.lru_cache(maxsize=1)
+def _locate_inkscape():
+    """
+    Find Inkscape executable in system PATH or common installation paths.
+
+    The result is cached, so the PATH is only scanned once per process.
+
+    Returns:
+        Path to Inkscape executable if found, None otherwise
+    """
+    # First, try to find in PATH
+    inkscape_path = shutil.which("inkscape")
+    if inkscape_path:
+        logger.debug(f"Found Inkscape in PATH: {inkscape_path}")
+        return inkscape_path
+
+    # Check each common path
+    for path in _COMMON_INKSCAPE_PATHS:
+        if Path(path).exists():
+            logger.debug(f"Found Inkscape at: {path}")
+            return path
+
+    logger.warning("Inkscape not found in PATH or common installation paths")
+    return None
+
 
 class InkscapeEngine(BasePDFEngine):
     """PDF conversion engine using Inkscape."""
 
-    def __init__(self):
-        """Initialize the Inkscape engine."""
+    def __init__(self, inkscape_path=None):
+        """
+        Initialize the Inkscape engine.
+
+        Args:
+            inkscape_path: Path to the Inkscape executable.
+                           If None, it is looked up in PATH and common installation paths.
+        """
+        self._configured_path = inkscape_path
         self._inkscape_path = None
+        self._version = None
 
     def find_inkscape(self):
         """
         Find Inkscape executable in system PATH or common installation paths.
 
+        If an explicit path was given to the engine, it is used instead.
+
         Returns:
             Path to Inkscape executable if found, None otherwise
         """
         if self._inkscape_path:
             return self._inkscape_path
 
-        # First, try to find in PATH
-        inkscape_path = shutil.which("inkscape")
-        if inkscape_path:
-            self._inkscape_path = inkscape_path
-            logger.debug(f"Found Inkscape in PATH: {inkscape_path}")
-            return inkscape_path
-
-        # Common installation paths for different operating systems
-        common_paths = []
-
-        if sys.platform == "win32":
-            # Windows common paths
-            common_paths = [
-                r"C:\Program Files\Inkscape\bin\inkscape.exe",
-                r"C:\Program Files (x86)\Inkscape\bin\inkscape.exe",
-                r"C:\Program Files\Inkscape\inkscape.exe",
-                r"C:\Program Files (x86)\Inkscape\inkscape.exe",
-            ]
-        elif sys.platform == "darwin":
-            # macOS common paths
-            common_paths = [
-                "/Applications/Inkscape.app/Contents/MacOS/inkscape",
-                "/usr/local/bin/inkscape",
-                "/opt/homebrew/bin/inkscape",
-            ]
-        elif sys.platform == "linux":
-            # Linux common paths
-            common_paths = [
-                "/usr/bin/inkscape",
-                "/usr/local/bin/inkscape",
-                "/snap/bin/inkscape",
-            ]
-
-        # Check each common path
-        for path in common_paths:
-            if Path(path).exists():
-                self._inkscape_path = path
-                logger.debug(f"Found Inkscape at: {path}")
-                return path
-
-        logger.warning("Inkscape not found in PATH or common installation paths")
-        return None
+        if self._configured_path:
+            inkscape_path = shutil.which(self._configured_path)
+            if inkscape_path:
+                logger.debug(f"Using configured Inkscape: {inkscape_path}")
+            else:
+                logger.warning(f"Inkscape not found at configured path: {self._configured_path}")
+        else:
+            inkscape_path = _locate_inkscape()
+        self._inkscape_path = inkscape_path
+        return inkscape_path
 
     def is_available(self):
         """
@@ -88,21 +128,149 @@ class InkscapeEngine(BasePDFEngine):
             logger.debug("Inkscape is not available")
         return available
 
-    def combine_svgs_to_pdf(self, svg_dir, output_pdf, **kwargs):
+    def get_version(self):
+        """
+        Get the version of the installed Inkscape.
+
+        Returns:
+            Version as a (major, minor) tuple, or None if it cannot be determined
+        """
+        if self._version is None:
+            self._version = ()
+            try:
+                result = subprocess.run(
+                    [self.find_inkscape(), "--version"],
+                    capture_output=True, text=True, timeout=30,
+                )
+                match = re.search(r"Inkscape (\d+)\.(\d+)", result.stdout)
+                if match:
+                    self._version = (int(match.group(1)), int(match.group(2)))
+                    logger.debug(f"Inkscape version: {self._version[0]}.{self._version[1]}")
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.debug(f"Could not determine Inkscape version: {e}")
+        return self._version or None
+
+    def supports_shell(self):
+        """
+        Check if the installed Inkscape can batch exports in --shell mode.
+
+        Returns:
+            True if --shell mode can be used, False otherwise
+        """
+        version = self.get_version()
+        return version is not None and version >= SHELL_MIN_VERSION
+
+    def _can_use_shell(self, svg_files, pdf_files):
+        """
+        Check if the files can be converted by one Inkscape process in --shell mode.
+
+        Returns:
+            True if --shell mode can be used, False otherwise
+        """
+        if not self.supports_shell():
+            return False
+        if any(_SHELL_UNSAFE_CHARS.intersection(str(path)) for path in (*svg_files, *pdf_files)):
+            logger.debug("File paths can't be passed to Inkscape --shell, starting Inkscape per file")
+            return False
+        return True
+
+    def _convert_with_shell(self, inkscape_path, svg_files, pdf_files):
+        """Convert all SVG files with a single Inkscape process in --shell mode."""
+        # Only files written by this run may count as converted
+        for pdf_file in pdf_files:
+            pdf_file.unlink(missing_ok=True)
+
+        commands = "".join(
+            f"file-open:{svg_file}; export-type:pdf; export-filename:{pdf_file}; export-do; file-close\n"
+            for svg_file, pdf_file in zip(svg_files, pdf_files)
+        )
+        commands += "quit\n"
+
+        logger.debug(f"Converting {len(svg_files)} SVG file(s) with one Inkscape shell process")
+        try:
+            result = subprocess.run(
+                [inkscape_path, "--shell"],
+                input=commands, capture_output=True, text=True,
+                timeout=60 * len(svg_files),
+            )
+        except subprocess.TimeoutExpired:
+            logger.error("Inkscape shell conversion timed out")
+            sys.exit(1)
+        except Exception as e:
+            logger.error(f"Error running Inkscape shell: {e}", exc_info=True)
+            sys.exit(1)
+        if result.returncode != 0:
+            logger.error(f"Inkscape shell conversion failed: {result.stderr}")
+            sys.exit(1)
+
+        for idx, (svg_file, pdf_file) in enumerate(zip(svg_files, pdf_files), 1):
+            if not pdf_file.exists():
+                logger.error(f"Failed to convert {svg_file.name}: {result.stderr}")
+                sys.exit(1)
+            logger.info(f"Converted ({idx}/{len(svg_files)}): {svg_file.name} -> {pdf_file.name}")
+
+    def _convert_one(self, inkscape_path, svg_file, temp_pdf):
+        """
+        Convert a single SVG file with its own Inkscape process.
+
+        Returns:
+            None on success, otherwise an error message
+        """
+        logger.debug(f"Converting SVG to PDF: {svg_file.name}")
+        cmd = [
+            inkscape_path,
+            "--without-gui",
+            str(svg_file),
+            f"--export-filename={temp_pdf}",
+            f"--export-type=pdf",
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        except subprocess.TimeoutExpired:
+            return f"Inkscape conversion timed out for {svg_file.name}"
+        except Exception as e:
+            return f"Error converting {svg_file.name}: {e}"
+        if result.returncode != 0:
+            return f"Failed to convert {svg_file.name}: {result.stderr}"
+        return None
+
+    def _convert_each(self, inkscape_path, svg_files, pdf_files, jobs=None):
+        """Convert SVG files starting Inkscape once per file, running up to jobs processes at a time."""
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        workers = max(1, min(jobs, len(svg_files)))
+        logger.debug(f"Converting {len(svg_files)} SVG file(s) with up to {workers} Inkscape process(es)")
+
+        # Threads only wait on the Inkscape subprocesses, so the GIL is not a bottleneck
+        executor = ThreadPoolExecutor(max_workers=workers)
+        with executor:
+            convert = functools.partial(self._convert_one, inkscape_path)
+            errors = executor.map(convert, svg_files, pdf_files)
+            for idx, (svg_file, temp_pdf, error) in enumerate(zip(svg_files, pdf_files, errors), 1):
+                if error:
+                    logger.error(error)
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    sys.exit(1)
+                logger.info(f"Converted ({idx}/{len(svg_files)}): {svg_file.name} -> {temp_pdf.name}")
+
+    def combine_svgs_to_pdf(self, svg_dir, output_pdf, jobs=None, **kwargs):
         """
         Combine multiple SVG files into a single PDF using Inkscape.
 
+        With Inkscape 1.2 or later all pages are exported by one Inkscape
+        process in --shell mode; older versions are started once per page,
+        with several pages converted concurrently.
+
         Args:
             svg_dir: Directory containing SVG files
             output_pdf: Path to output PDF file
+            jobs: Number of concurrent Inkscape processes for older Inkscape versions.
+                  If None, use one per CPU.
             **kwargs: Unused for Inkscape engine
         """
         logger.info(f"Starting SVG to PDF conversion using Inkscape for: {svg_dir}")
-        # Get all SVG files, sorted by name
-        svg_files = sorted(
-            Path(svg_dir).glob("page_*.svg"),
-            key=lambda x: int(x.stem.split("_")[1])
-        )
+        # Get all SVG files, sorted by page number
+        svg_files = [Path(path) for _, path in find_svg_pages(svg_dir)]
 
         if not svg_files:
             logger.error(f"No SVG files found in {svg_dir}")
@@ -110,58 +278,38 @@ class InkscapeEngine(BasePDFEngine):
 
         logger.info(f"Found {len(svg_files)} SVG file(s) to convert")
         inkscape_path = self.find_inkscape()
-        pdf_files = []
 
         with tempfile.TemporaryDirectory() as temp_dir:
             logger.debug(f"Using temporary directory: {temp_dir}")
+            pdf_files = [
+                Path(temp_dir) / f"{svg_file.stem}.pdf"
+                for svg_file in svg_files
+            ]
+
             # Convert each SVG to PDF using Inkscape
-            for idx, svg_file in enumerate(svg_files, 1):
-                temp_pdf = Path(temp_dir) / f"page_{svg_file.stem.split('_')[1]}.pdf"
-
-                try:
-                    logger.debug(f"Converting SVG to PDF: {svg_file.name}")
-                    cmd = [
-                        inkscape_path,
-                        "--without-gui",
-                        str(svg_file),
-                        f"--export-filename={temp_pdf}",
-                        f"--export-type=pdf",
-                    ]
-
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-
-                    if result.returncode == 0:
-                        pdf_files.append(temp_pdf)
-                        logger.info(f"Converted ({idx}/{len(svg_files)}): {svg_file.name} -> {temp_pdf.name}")
-                    else:
-                        logger.error(f"Failed to convert {svg_file.name}: {result.stderr}")
-                        sys.exit(1)
-
-                except subprocess.TimeoutExpired:
-                    logger.error(f"Inkscape conversion timed out for {svg_file.name}")
-                    sys.exit(1)
-                except Exception as e:
-                    logger.error(f"Error converting {svg_file.name}: {e}", exc_info=True)
-                    sys.exit(1)
+            if self._can_use_shell(svg_files, pdf_files):
+                self._convert_with_shell(inkscape_path, svg_files, pdf_files)
+            else:
+                self._convert_each(inkscape_path, svg_files, pdf_files, jobs)
 
             # Merge all PDFs into one
             try:
                 logger.info(f"Merging {len(pdf_files)} PDF file(s) into {output_pdf}")
-                from PyPDF2 import PdfMerger
+                PdfWriter = load_pdf_writer()
 
-                merger = PdfMerger()
+                writer = PdfWriter()
                 for pdf_file in pdf_files:
-                    merger.append(str(pdf_file))
-                merger.write(output_pdf)
-                merger.close()
+                    writer.append(str(pdf_file))
+                buffer = io.BytesIO()
+                writer.write(buffer)
+                write_pdf_file(output_pdf, buffer.getvalue())
                 logger.info(f"Successfully saved PDF: {output_pdf}")
 
             except ImportError:
                 # Fallback: copy first PDF as a workaround
-                logger.warning("PyPDF2 not available, using single-page fallback")
+                logger.warning("Neither pypdf nor PyPDF2 is available, using single-page fallback")
 
                 if pdf_files:
-                    import shutil
-                    shutil.copy(str(pdf_files[0]), output_pdf)
-                    logger.warning("Only first page saved. Install PyPDF2 for full merging: pip install PyPDF2")
+                    write_pdf_file(output_pdf, pdf_files[0].read_bytes())
+                    logger.warning("Only first page saved. Install pypdf for full merging: pip install pypdf")
                     logger.info(f"Saved PDF (single page): {output_pdf}")
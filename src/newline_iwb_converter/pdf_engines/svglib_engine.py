@@ -2,18 +2,345 @@
 
 """SVGlib PDF conversion engine."""
 
+import gzip
+import hashlib
+import io
+import os
+import pickle
 import sys
 import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
+from reportlab import Version as reportlab_version
 from reportlab.pdfgen import canvas
 from reportlab.graphics import renderPDF
-from svglib.svglib import svg2rlg
+from reportlab.graphics.shapes import Image
+from lxml import etree as ET
+from svglib import __version__ as svglib_version
+from svglib.svglib import Svg2RlgAttributeConverter, SvgRenderer, load_svg_file
 
-from newline_iwb_converter.pdf_engines.base import BasePDFEngine
+try:
+    from svglib.svglib import PX_TO_PT
+except ImportError:
+    # Older svglib versions, whose drawing size is not derived the same way
+    PX_TO_PT = None
+
+from newline_iwb_converter.concurrency import map_bounded
+from newline_iwb_converter.pdf_engines.base import BasePDFEngine, find_svg_pages, load_pdf_writer, write_pdf_file
 
 logger = logging.getLogger("newline_iwb_converter.pdf_engines.svglib")
 
+# Space left around each drawing, in points
+PAGE_PADDING = 10
+
+# Setting this environment variable to 1 caches converted drawings on disk
+CACHE_ENV_VAR = "IWB_SVG_CACHE"
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "newline_iwb_converter" / "svglib"
+# Least recently used drawings are evicted above this total size, checked
+# after each PDF
+CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+
+def _cache_enabled():
+    """Check whether the on-disk drawing cache is enabled."""
+    return os.environ.get(CACHE_ENV_VAR) == "1"
+
+
+def _cache_key(svg_data):
+    """Get the cache key of an SVG document (svglib and reportlab versions are part of it, as pickles are not portable)."""
+    digest = hashlib.blake2b(svg_data, digest_size=16, person=b"svglib")
+    digest.update(f"{svglib_version}/{reportlab_version}".encode())
+    return digest.hexdigest()
+
+
+def _load_cached_drawing(key):
+    """
+    Load a drawing from the on-disk cache.
+
+    Returns:
+        The cached drawing, or None on a cache miss
+    """
+    cache_file = CACHE_DIR / f"{key}.pkl"
+    try:
+        with open(cache_file, "rb") as f:
+            drawing = pickle.load(f)
+        # Bump the mtime so the entry counts as recently used
+        os.utime(cache_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cache entry {cache_file}: {e}")
+        return None
+    return drawing
+
+
+def _has_images(node):
+    """Check whether a drawing or group contains bitmap images."""
+    for child in getattr(node, "contents", ()):
+        if isinstance(child, Image) or _has_images(child):
+            return True
+    return False
+
+
+def _store_cached_drawing(key, drawing):
+    """Store a drawing in the on-disk cache."""
+    # Images decoded by svglib are PIL objects that lose their file data when pickled
+    if _has_images(drawing):
+        return
+    cache_file = CACHE_DIR / f"{key}.pkl"
+    temp_file = cache_file.with_name(f"{key}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(temp_file, "wb") as f:
+            pickle.dump(drawing, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except Exception as e:
+        logger.debug(f"Could not write cache entry {cache_file}: {e}")
+        temp_file.unlink(missing_ok=True)
+
+
+def _prune_cache():
+    """Delete the least recently used cache entries until the cache fits in CACHE_MAX_BYTES."""
+    entries = []
+    total_size = 0
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+    except OSError as e:
+        logger.debug(f"Could not list drawing cache {CACHE_DIR}: {e}")
+        return
+
+    if total_size <= CACHE_MAX_BYTES:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+        if total_size <= CACHE_MAX_BYTES:
+            break
+    logger.debug(f"Pruned drawing cache to {total_size} bytes")
+
+
+class _AttributeConverter(Svg2RlgAttributeConverter):
+    """svglib attribute converter with a fast path for unitless lengths."""
+
+    def convertLength(self, svgAttr, *args, **kwargs):
+        # Pen strokes are polylines with thousands of bare numbers, each of
+        # which svglib checks against every unit suffix before calling float()
+        try:
+            return float(svgAttr)
+        except (TypeError, ValueError):
+            return super().convertLength(svgAttr, *args, **kwargs)
+
+
+class _SvgRenderer(SvgRenderer):
+    """svglib renderer using _AttributeConverter."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        attr_converter = _AttributeConverter()
+        attr_converter.css_rules = self.attrConverter.css_rules
+        # The shape converter keeps its own reference to the attribute converter
+        self.attrConverter = attr_converter
+        self.shape_converter.attrConverter = attr_converter
+
+
+def _svg2rlg(source):
+    """
+    Convert an SVG document to a ReportLab drawing, like svglib's svg2rlg.
+
+    Args:
+        source: Path to the SVG (or gzip-compressed .svgz) file, or a binary file-like object
+
+    Returns:
+        ReportLab drawing object, or None if the SVG could not be loaded
+    """
+    if isinstance(source, Path):
+        source = str(source)
+    if isinstance(source, str) and os.path.splitext(source)[1].lower() == ".svgz":
+        # Decompress in memory; the renderer still gets the original path, so
+        # relative references resolve next to it
+        with gzip.open(source, "rb") as f:
+            svg_root = load_svg_file(io.BytesIO(f.read()))
+    else:
+        svg_root = load_svg_file(source)
+    if svg_root is None:
+        return None
+    return _SvgRenderer(source).render(svg_root)
+
+
+def _convert_svg(source, svg_data=None):
+    """
+    Convert an SVG document to a ReportLab drawing, going through the on-disk cache if enabled.
+
+    Args:
+        source: Path to the SVG file, or a binary file-like object
+        svg_data: Content of the SVG document, if already read
+
+    Returns:
+        ReportLab drawing object (None if svglib could not convert it)
+    """
+    key = None
+    if _cache_enabled():
+        if svg_data is None:
+            svg_data = Path(source).read_bytes()
+        key = _cache_key(svg_data)
+        drawing = _load_cached_drawing(key)
+        if drawing is not None:
+            logger.debug(f"Loaded cached drawing ({drawing.width}x{drawing.height})")
+            return drawing
+
+    drawing = _svg2rlg(source)
+    if drawing and key:
+        _store_cached_drawing(key, drawing)
+    return drawing
+
+
+# Recently converted drawings, by content digest or (path, mtime, size).
+# Drawings are only read while rendering, so duplicate pages (e.g. repeated
+# background templates) can share one. Only a few are kept, as each drawing
+# holds its page's decoded images, and the cache is cleared after every PDF.
+_RECENT_DRAWINGS_SIZE = 4
+_recent_drawings = OrderedDict()
+
+
+def _convert_cached(key, convert, *args):
+    """Call convert(*args), reusing the drawing of a recent call with the same key."""
+    try:
+        _recent_drawings.move_to_end(key)
+        return _recent_drawings[key]
+    except KeyError:
+        pass
+    drawing = convert(*args)
+    _recent_drawings[key] = drawing
+    if len(_recent_drawings) > _RECENT_DRAWINGS_SIZE:
+        _recent_drawings.popitem(last=False)
+    return drawing
+
+
+def _convert_svg_file(path):
+    """Convert an SVG file (keyed by its modification time and size, to notice changes)."""
+    stat = os.stat(path)
+    return _convert_cached((path, stat.st_mtime_ns, stat.st_size), _convert_svg, path)
+
+
+def _convert_svg_data(svg_data):
+    """Convert an in-memory SVG document."""
+    key = hashlib.blake2b(svg_data, digest_size=16).digest()
+    return _convert_cached(key, _convert_svg, io.BytesIO(svg_data), svg_data)
+
+
+def _draw_page(pdf_canvas, drawing, page_size=None):
+    """
+    Size the current canvas page for a drawing and render the drawing on it.
+
+    Args:
+        pdf_canvas: ReportLab canvas to draw on
+        drawing: ReportLab drawing of the SVG page
+        page_size: (width, height) of a uniform page to center the drawing on.
+                   If None, the page is sized to the drawing plus padding.
+
+    Returns:
+        (page_width, page_height) of the rendered page
+    """
+    # Get SVG dimensions
+    svg_width = drawing.width
+    svg_height = drawing.height
+
+    if page_size:
+        page_width, page_height = page_size
+    else:
+        # Set page size to match SVG dimensions (with small padding)
+        page_width = svg_width + PAGE_PADDING * 2
+        page_height = svg_height + PAGE_PADDING * 2
+
+    pdf_canvas.setPageSize((page_width, page_height))
+
+    # Draw SVG on the page (renderPDF saves and restores the graphics state itself)
+    if page_size:
+        # Center SVG on the page
+        x_offset = (page_width - svg_width) / 2
+        y_offset = (page_height - svg_height) / 2
+    else:
+        # Just add padding
+        x_offset = y_offset = PAGE_PADDING
+
+    renderPDF.draw(drawing, pdf_canvas, x_offset, y_offset)
+    return page_width, page_height
+
+
+def _svg_size(source):
+    """
+    Get the drawing size of an SVG page from the width and height of its root
+    element, without converting the page.
+
+    Args:
+        source: Path to the SVG file, or a binary file-like object
+
+    Returns:
+        (width, height) of the drawing svglib would create, or None if it
+        cannot be told without converting the page (e.g. percentage sizes)
+    """
+    if PX_TO_PT is None:
+        return None
+    try:
+        # Only the start of the root element is parsed
+        _, root = next(ET.iterparse(source, events=("start",)))
+        width, height = float(root.get("width")), float(root.get("height"))
+    except (OSError, ET.XMLSyntaxError, StopIteration, TypeError, ValueError):
+        return None
+    finally:
+        if hasattr(source, "seek"):
+            source.seek(0)
+    return width * PX_TO_PT, height * PX_TO_PT
+
+
+def _measure_page(source, name):
+    """Get the drawing size of one SVG page, converting it only if needed."""
+    size = _svg_size(source)
+    if size:
+        return size
+    try:
+        drawing = SvglibEngine().svg_to_pdf_page(source, name=name)
+    finally:
+        # The page is converted again when rendering, so rewind the stream
+        if hasattr(source, "seek"):
+            source.seek(0)
+    if drawing is None:
+        return None
+    return drawing.width, drawing.height
+
+
+def _render_page_pdf(source, name, page_size):
+    """
+    Worker process entry point: render one SVG page into a standalone one-page PDF.
+
+    Returns:
+        (pdf_bytes, page_width, page_height), or None if the SVG could not be converted
+    """
+    drawing = SvglibEngine().svg_to_pdf_page(source, name=name)
+    if drawing is None:
+        return None
+    buffer = io.BytesIO()
+    pdf_canvas = canvas.Canvas(buffer)
+    page_width, page_height = _draw_page(pdf_canvas, drawing, page_size)
+    pdf_canvas.save()
+    return buffer.getvalue(), page_width, page_height
+
 
 class SvglibEngine(BasePDFEngine):
     """PDF conversion engine using svglib."""
@@ -28,27 +355,37 @@ class SvglibEngine(BasePDFEngine):
         logger.debug("svglib is available (always available as a dependency)")
         return True
 
-    def svg_to_pdf_page(self, svg_path):
+    def svg_to_pdf_page(self, svg_path, name=None):
         """
         Convert an SVG file to a ReportLab drawing.
 
+        Identical pages are only parsed once per process, and the returned
+        drawing is shared between them. If the IWB_SVG_CACHE environment
+        variable is set to 1, drawings are also cached on disk by SVG content,
+        so unchanged pages are not parsed again on later runs.
+
         Args:
-            svg_path: Path to the SVG file
+            svg_path: Path to the SVG file, or a binary file-like object
+            name: Name used in log messages (default: svg_path)
 
         Returns:
             ReportLab drawing object or None if conversion failed
         """
+        name = name or svg_path
         try:
-            logger.debug(f"Converting SVG to ReportLab drawing: {svg_path}")
-            drawing = svg2rlg(svg_path)
+            logger.debug(f"Converting SVG to ReportLab drawing: {name}")
+            if hasattr(svg_path, "read"):
+                drawing = _convert_svg_data(svg_path.read())
+            else:
+                drawing = _convert_svg_file(os.fspath(svg_path))
             if drawing:
-                logger.debug(f"Successfully converted {svg_path} to drawing ({drawing.width}x{drawing.height})")
+                logger.debug(f"Successfully converted {name} to drawing ({drawing.width}x{drawing.height})")
             return drawing
         except Exception as e:
-            logger.warning(f"Could not convert {svg_path} to drawing: {e}")
+            logger.warning(f"Could not convert {name} to drawing: {e}")
             return None
 
-    def combine_svgs_to_pdf(self, svg_dir, output_pdf, uniform_size=False, **kwargs):
+    def combine_svgs_to_pdf(self, svg_dir, output_pdf, uniform_size=False, jobs=None, **kwargs):
         """
         Combine multiple SVG files from a directory into a single PDF using svglib.
 
@@ -57,89 +394,263 @@ class SvglibEngine(BasePDFEngine):
             output_pdf: Path to output PDF file
             uniform_size: If True, all pages have the size of the largest page.
                           If False, each page is sized independently (default).
+            jobs: Number of worker processes used to render pages.
+                  If None, use one per CPU. 1 renders pages sequentially.
             **kwargs: Additional options (unused)
         """
-        logger.info(f"Starting SVG to PDF conversion using svglib for: {svg_dir}")
-        # Get all SVG files, sorted by name
-        svg_files = sorted(
-            Path(svg_dir).glob("page_*.svg"),
-            key=lambda x: int(x.stem.split("_")[1])
-        )
+        try:
+            self._combine_dir(svg_dir, output_pdf, uniform_size, jobs)
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            sys.exit(1)
+
+    def combine_svg_bytes_to_pdf(self, svg_pages, output_pdf, uniform_size=False, jobs=None, **kwargs):
+        """
+        Combine in-memory SVG documents into a single PDF using svglib.
 
-        if not svg_files:
-            logger.error(f"No SVG files found in {svg_dir}")
+        Args:
+            svg_pages: SVG documents as bytes, in page order
+            output_pdf: Path to output PDF file
+            uniform_size: If True, all pages have the size of the largest page.
+                          If False, each page is sized independently (default).
+            jobs: Number of worker processes used to render pages.
+                  If None, use one per CPU. 1 renders pages sequentially.
+            **kwargs: Additional options (unused)
+        """
+        logger.info(f"Starting SVG to PDF conversion using svglib for {len(svg_pages)} page(s)")
+        if not svg_pages:
+            logger.error("No SVG pages to convert")
             sys.exit(1)
 
-        logger.info(f"Found {len(svg_files)} SVG file(s) to convert")
-        # If uniform size is requested, first pass to find max dimensions
-        max_width = 0
-        max_height = 0
-        drawings = []
+        pages = [(f"page_{idx}.svg", io.BytesIO(svg_data)) for idx, svg_data in enumerate(svg_pages)]
+        self._convert_pages(pages, output_pdf, uniform_size, jobs)
 
-        for svg_file in svg_files:
-            drawing = self.svg_to_pdf_page(str(svg_file))
-            if drawing is None:
-                logger.warning(f"Skipping {svg_file} (conversion failed)")
-                drawings.append(None)
-                continue
-            drawings.append(drawing)
-            if uniform_size:
-                max_width = max(max_width, drawing.width)
-                max_height = max(max_height, drawing.height)
+    def combine_many(self, conversions, jobs=None):
+        """
+        Combine several directories of SVG files, one PDF each, sharing one
+        pool of worker processes instead of starting a new one per PDF.
+
+        A directory that can't be converted doesn't stop the others: every
+        PDF is attempted, then a RuntimeError reports the ones that failed.
+
+        Args:
+            conversions: Iterable of (svg_dir, output_pdf, options) tuples, where
+                         options is a dict of combine_svgs_to_pdf keyword arguments
+                         (e.g. {"uniform_size": True})
+            jobs: Number of worker processes used to render pages.
+                  If None, use one per CPU. 1 renders pages sequentially.
+
+        Raises:
+            RuntimeError: If any of the PDFs could not be created
+        """
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        # Don't try to start workers again for every PDF if it failed once
+        pool = self._start_pool(jobs) if jobs > 1 else None
+        if pool is not None:
+            logger.debug(f"Rendering pages with {pool[1]} shared worker processes")
+
+        failures = []
+        try:
+            for svg_dir, output_pdf, options in conversions:
+                options = {**options, "jobs": 1, "pool": pool}
+                try:
+                    self._combine_dir(svg_dir, output_pdf, **options)
+                except Exception as e:
+                    logger.error(f"Failed to create {output_pdf}: {e}")
+                    failures.append((output_pdf, e))
+        finally:
+            if pool is not None:
+                pool[0].shutdown()
+
+        if failures:
+            failed = ", ".join(str(output_pdf) for output_pdf, _ in failures)
+            raise RuntimeError(f"Failed to create {len(failures)} PDF(s): {failed}") from failures[0][1]
+
+    def _combine_dir(self, svg_dir, output_pdf, uniform_size=False, jobs=None, pool=None, **kwargs):
+        """
+        Combine the SVG files of a directory into a single PDF.
 
+        Args:
+            svg_dir: Directory containing SVG files
+            output_pdf: Path to output PDF file
+            uniform_size: If True, all pages have the size of the largest page
+            jobs: Number of worker processes (None: one per CPU)
+            pool: Running worker pool from _start_pool to render pages with,
+                  instead of starting one
+            **kwargs: Additional options (unused)
+
+        Raises:
+            FileNotFoundError: If the directory has no SVG files
+        """
+        logger.info(f"Starting SVG to PDF conversion using svglib for: {svg_dir}")
+        # Get all SVG files, sorted by page number
+        pages = find_svg_pages(svg_dir)
+
+        if not pages:
+            raise FileNotFoundError(f"No SVG files found in {svg_dir}")
+
+        logger.info(f"Found {len(pages)} SVG file(s) to convert")
+        self._convert_pages(pages, output_pdf, uniform_size, jobs, pool)
+
+    def _convert_pages(self, pages, output_pdf, uniform_size, jobs=None, pool=None):
+        """
+        Render SVG pages into a single PDF (see _write_pdf), then release what
+        the conversion left behind.
+        """
+        try:
+            self._write_pdf(pages, output_pdf, uniform_size, jobs, pool)
+        finally:
+            # Don't keep the last pages' drawings alive once the PDF is written
+            _recent_drawings.clear()
+            # Entries are stored by worker processes too, so the size is only
+            # checked once the whole PDF is done
+            if _cache_enabled():
+                _prune_cache()
+
+    def _start_pool(self, workers):
+        """
+        Start the worker processes used to render pages in parallel.
+
+        Args:
+            workers: Number of worker processes
+
+        Returns:
+            (executor, workers, PdfWriter class), or None if pages must be
+            rendered sequentially
+        """
+        try:
+            PdfWriter = load_pdf_writer()
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except ImportError:
+            logger.warning("Neither pypdf nor PyPDF2 is available, rendering pages sequentially")
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Could not start worker processes, rendering pages sequentially: {e}")
+        else:
+            return executor, workers, PdfWriter
+        return None
+
+    def _write_pdf(self, pages, output_pdf, uniform_size, jobs=None, pool=None):
+        """
+        Render SVG pages into a single PDF.
+
+        Pages are rendered in worker processes into one-page PDFs that are then
+        merged, unless only one worker is available.
+
+        Args:
+            pages: List of (name, source) tuples, where source is a path or file-like object
+            output_pdf: Path to output PDF file
+            uniform_size: If True, all pages have the size of the largest page
+            jobs: Number of worker processes (None: one per CPU)
+            pool: Running worker pool from _start_pool to render pages with.
+                  It is left running; jobs is ignored.
+        """
+        if pool is not None:
+            executor, workers, PdfWriter = pool
+            self._write_pdf_parallel(pages, output_pdf, uniform_size, executor, workers, PdfWriter)
+            return
+
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        workers = min(jobs, len(pages))
+        pool = self._start_pool(workers) if workers > 1 else None
+        if pool is not None:
+            executor, workers, PdfWriter = pool
+            logger.debug(f"Rendering {len(pages)} page(s) with {workers} worker processes")
+            with executor:
+                self._write_pdf_parallel(pages, output_pdf, uniform_size, executor, workers, PdfWriter)
+            return
+
+        page_count = len(pages)
+        uniform_page_size = None
+        uniform_note = None
         if uniform_size:
-            padding = 10
-            uniform_page_width = max_width + padding * 2
-            uniform_page_height = max_height + padding * 2
-            logger.debug(f"Uniform page size set to: {uniform_page_width}x{uniform_page_height}")
+            # First pass to find max dimensions
+            uniform_page_size = self._uniform_page_size(_measure_page(source, name) for name, source in pages)
+            # Every page has this size, so the log note is built once
+            uniform_note = f"centered on {uniform_page_size[0]}x{uniform_page_size[1]}"
 
-        # Create PDF
+        # Create PDF (in memory, it is written out at once when complete)
         logger.debug(f"Creating PDF canvas: {output_pdf}")
-        pdf_canvas = canvas.Canvas(output_pdf)
+        buffer = io.BytesIO()
+        pdf_canvas = canvas.Canvas(buffer)
+        show_page = pdf_canvas.showPage
+        added_count = 0
 
-        for idx, (svg_file, drawing) in enumerate(zip(svg_files, drawings), 1):
+        # Pages are converted as they are drawn, rather than all up front
+        for idx, (name, source) in enumerate(pages, 1):
+            drawing = self.svg_to_pdf_page(source, name=name)
             if drawing is None:
+                logger.warning(f"Skipping {name} (conversion failed)")
                 continue
 
-            # Get SVG dimensions
-            svg_width = drawing.width
-            svg_height = drawing.height
-
-            if uniform_size:
-                page_width = uniform_page_width
-                page_height = uniform_page_height
-                padding = 10
-            else:
-                # Set page size to match SVG dimensions (with small padding)
-                padding = 10
-                page_width = svg_width + padding * 2
-                page_height = svg_height + padding * 2
-
-            pdf_canvas.setPageSize((page_width, page_height))
-
-            # Draw SVG on the page
-            if uniform_size:
-                # Center SVG on the page
-                x_offset = (page_width - svg_width) / 2
-                y_offset = (page_height - svg_height) / 2
-                pdf_canvas.saveState()
-                pdf_canvas.translate(x_offset, y_offset)
-            else:
-                # Just add padding
-                pdf_canvas.saveState()
-                pdf_canvas.translate(padding, padding)
-
-            renderPDF.draw(drawing, pdf_canvas, 0, 0)
-            pdf_canvas.restoreState()
+            page_width, page_height = _draw_page(pdf_canvas, drawing, uniform_page_size)
 
             # Add new page for next SVG (except for the last one)
-            if idx < len(drawings):
-                pdf_canvas.showPage()
+            if idx < page_count:
+                show_page()
 
-            if uniform_size:
-                logger.info(f"Added to PDF ({idx}/{len(svg_files)}): {svg_file.name} (centered on {page_width}x{page_height})")
-            else:
-                logger.info(f"Added to PDF ({idx}/{len(svg_files)}): {svg_file.name} ({page_width}x{page_height})")
+            size_note = uniform_note or f"{page_width}x{page_height}"
+            logger.debug(f"Added to PDF ({idx}/{page_count}): {name} ({size_note})")
+            added_count += 1
 
         pdf_canvas.save()
+        write_pdf_file(output_pdf, buffer.getvalue())
+        logger.info(f"Added {added_count} page(s) to PDF")
+        logger.info(f"Successfully saved PDF: {output_pdf}")
+
+    def _uniform_page_size(self, sizes):
+        """
+        Get the page size fitting the largest page plus padding.
+
+        Args:
+            sizes: (width, height) of each page's drawing (None for pages that failed)
+
+        Returns:
+            (page_width, page_height) of the uniform page
+        """
+        # Transpose once, so both maximums are computed by max() in C
+        widths, heights = zip((0, 0), *filter(None, sizes))
+        max_width, max_height = max(widths), max(heights)
+        uniform_page_size = (max_width + PAGE_PADDING * 2, max_height + PAGE_PADDING * 2)
+        logger.debug(f"Uniform page size set to: {uniform_page_size[0]}x{uniform_page_size[1]}")
+        return uniform_page_size
+
+    def _write_pdf_parallel(self, pages, output_pdf, uniform_size, executor, workers, PdfWriter):
+        """Render every page into its own PDF in the worker pool, then merge them in order."""
+        names = [name for name, _ in pages]
+        sources = [source for _, source in pages]
+
+        page_count = len(pages)
+        uniform_page_size = None
+        uniform_note = None
+        if uniform_size:
+            # First pass to find max dimensions. Most pages are measured from
+            # their root element, so this is done here rather than in the workers.
+            uniform_page_size = self._uniform_page_size(map(_measure_page, sources, names))
+            # Every page has this size, so the log note is built once
+            uniform_note = f"centered on {uniform_page_size[0]}x{uniform_page_size[1]}"
+
+        writer = PdfWriter()
+        added_count = 0
+        # Workers stay busy while the pages already rendered are merged here
+        results = map_bounded(
+            executor, _render_page_pdf, sources, names, repeat(uniform_page_size),
+            max_pending=workers * 2,
+        )
+        for idx, (name, result) in enumerate(zip(names, results), 1):
+            if result is None:
+                logger.warning(f"Skipping {name} (conversion failed)")
+                continue
+            pdf_data, page_width, page_height = result
+            writer.append(io.BytesIO(pdf_data))
+
+            size_note = uniform_note or f"{page_width}x{page_height}"
+            logger.debug(f"Added to PDF ({idx}/{page_count}): {name} ({size_note})")
+            added_count += 1
+
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        write_pdf_file(output_pdf, buffer.getvalue())
+        logger.info(f"Added {added_count} page(s) to PDF")
         logger.info(f"Successfully saved PDF: {output_pdf}")
@@ -0,0 +1,21 @@
+"""Tests for the worker process helpers."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from newline_iwb_converter.concurrency import map_bounded
+
+
+def test_map_bounded_keeps_order_and_reads_input_lazily():
+    consumed = []
+
+    def items():
+        for item in range(10):
+            consumed.append(item)
+            yield item
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = map_bounded(executor, lambda x, y: x * y, items(), range(10), max_pending=3)
+        assert next(results) == 0
+        # Only the submitted items have been taken from the input
+        assert len(consumed) == 4
+        assert list(results) == [x * x for x in range(1, 10)]
@@ -0,0 +1,93 @@
+"""Tests for the Inkscape PDF engine, run against a fake Inkscape."""
+
+import sys
+
+import pytest
+
+from newline_iwb_converter.pdf_engines import inkscape_engine
+from newline_iwb_converter.pdf_engines.inkscape_engine import InkscapeEngine
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    from PyPDF2 import PdfReader
+
+FAKE_INKSCAPE = """#!{python}
+# Stands in for Inkscape 1.2: logs how it was called and writes blank PDFs
+import sys
+from reportlab.pdfgen import canvas
+
+def export(pdf_path):
+    pdf_canvas = canvas.Canvas(pdf_path)
+    pdf_canvas.showPage()
+    pdf_canvas.save()
+
+args = sys.argv[1:]
+with open({log!r}, "a") as log:
+    log.write(" ".join(args[:1]) + "\\n")
+if args == ["--version"]:
+    print("Inkscape 1.2.2 (b0a8486541, 2022-12-01)")
+elif args == ["--shell"]:
+    for line in sys.stdin:
+        if line.strip() == "quit":
+            break
+        actions = dict(action.strip().split(":", 1) for action in line.split(";") if ":" in action)
+        export(actions["export-filename"])
+    sys.exit({shell_exit_code})
+else:
+    export(args[-2].split("=", 1)[1])
+"""
+
+
+def make_inkscape(tmp_path, shell_exit_code=0):
+    """Write a fake Inkscape executable, returning it and its call log."""
+    inkscape = tmp_path / "inkscape"
+    log = tmp_path / "inkscape.log"
+    inkscape.write_text(FAKE_INKSCAPE.format(python=sys.executable, log=str(log), shell_exit_code=shell_exit_code))
+    inkscape.chmod(0o755)
+    return inkscape, log
+
+
+def make_svg_dir(svg_dir, page_count):
+    svg_dir.mkdir()
+    for idx in range(page_count):
+        (svg_dir / f"page_{idx}.svg").write_text('<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>')
+    return svg_dir
+
+
+@pytest.mark.parametrize("dir_name, first_arg", [("svgs", "--shell"), ("a;b", "--without-gui")])
+def test_paths_that_break_shell_actions_are_converted_per_file(tmp_path, dir_name, first_arg):
+    inkscape, log = make_inkscape(tmp_path)
+    svg_dir = make_svg_dir(tmp_path / dir_name, 3)
+    output_pdf = tmp_path / "out.pdf"
+
+    InkscapeEngine(str(inkscape)).combine_svgs_to_pdf(svg_dir, output_pdf, jobs=1)
+
+    assert len(PdfReader(str(output_pdf)).pages) == 3
+    assert first_arg in log.read_text().splitlines()
+
+
+def test_failed_shell_run_is_an_error(tmp_path):
+    inkscape, _ = make_inkscape(tmp_path, shell_exit_code=1)
+    svg_dir = make_svg_dir(tmp_path / "svgs", 2)
+    output_pdf = tmp_path / "out.pdf"
+
+    # Every page was exported, but Inkscape reported a failure
+    with pytest.raises(SystemExit):
+        InkscapeEngine(str(inkscape)).combine_svgs_to_pdf(svg_dir, output_pdf)
+
+    assert not output_pdf.exists()
+
+
+def test_first_page_is_saved_without_a_pdf_library(tmp_path, monkeypatch):
+    def no_pdf_library():
+        raise ImportError("No module named 'pypdf'")
+
+    monkeypatch.setattr(inkscape_engine, "load_pdf_writer", no_pdf_library)
+    inkscape, _ = make_inkscape(tmp_path)
+    svg_dir = make_svg_dir(tmp_path / "svgs", 2)
+    output_pdf = tmp_path / "out.pdf"
+
+    InkscapeEngine(str(inkscape)).combine_svgs_to_pdf(svg_dir, output_pdf)
+
+    assert len(PdfReader(str(output_pdf)).pages) == 1
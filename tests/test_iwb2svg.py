@@ -0,0 +1,122 @@
+"""Tests for the IWB to SVG extraction."""
+
+import zipfile
+
+import pytest
+from lxml import etree as ET
+
+from newline_iwb_converter import iwb2svg
+from newline_iwb_converter.iwb2svg import convert_textarea_to_text, extract_iwb_to_svg, process_images_data_uri
+
+CONTENT_XML = """<?xml version='1.0' encoding='UTF-8'?>
+<iwb version="1.0" xmlns="http://www.imsglobal.org/xsd/iwb_v1p0" xmlns:svg="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">
+<svg:svg width="200" height="100">
+<svg:pageset>
+{pages}
+</svg:pageset>
+</svg:svg>
+</iwb>
+"""
+
+PAGE_XML = """<svg:page height="100" id="{idx}" width="200">
+  <svg:image id="Image1" x="0" y="0" width="10" height="10" xlink:href="images/big.png"/>
+</svg:page>"""
+
+
+def make_iwb(path, page_count=1):
+    """Write an IWB file whose pages show the same 4 KiB image."""
+    pages = "\n".join(PAGE_XML.format(idx=idx) for idx in range(page_count))
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("content.xml", CONTENT_XML.format(pages=pages))
+        z.writestr("images/big.png", b"\x89PNG" + b"\0" * 4092)
+    return path
+
+
+def test_data_uri_max_size_embeds_everything_without_output_dir(tmp_path):
+    iwb_path = make_iwb(tmp_path / "test.iwb")
+    pages = {}
+
+    extract_iwb_to_svg(iwb_path, None, jobs=1, sink=pages.__setitem__, data_uri_max_size=1024)
+
+    # There is no directory to copy the image to, so it must not be left
+    # referenced by a dangling relative path
+    assert b'href="images/big.png"' not in pages[0]
+    assert b"data:image/png;base64," in pages[0]
+
+
+def test_data_uri_max_size_copies_large_images_to_output_dir(tmp_path):
+    iwb_path = make_iwb(tmp_path / "test.iwb")
+    output_dir = tmp_path / "out"
+
+    extract_iwb_to_svg(iwb_path, str(output_dir), jobs=1, data_uri_max_size=1024)
+
+    assert b'href="images/big.png"' in (output_dir / "page_0.svg").read_bytes()
+    assert (output_dir / "images" / "big.png").exists()
+
+
+def fail_to_start_pool(*args, **kwargs):
+    raise OSError("no worker processes here")
+
+
+def test_single_page_is_converted_without_worker_processes(tmp_path, monkeypatch):
+    iwb_path = make_iwb(tmp_path / "test.iwb")
+    expected = {}
+    extract_iwb_to_svg(iwb_path, None, jobs=1, sink=expected.__setitem__)
+
+    monkeypatch.setattr(iwb2svg, "ProcessPoolExecutor", pytest.fail)
+    pages = {}
+    extract_iwb_to_svg(iwb_path, None, jobs=2, sink=pages.__setitem__)
+
+    assert pages == expected
+
+
+@pytest.mark.parametrize("page_count", [2, 3])
+def test_pages_read_ahead_are_kept_when_workers_cannot_start(tmp_path, monkeypatch, page_count):
+    iwb_path = make_iwb(tmp_path / "test.iwb", page_count)
+    expected = {}
+    extract_iwb_to_svg(iwb_path, None, jobs=1, sink=expected.__setitem__)
+
+    monkeypatch.setattr(iwb2svg, "ProcessPoolExecutor", fail_to_start_pool)
+    pages = {}
+    extract_iwb_to_svg(iwb_path, None, jobs=2, sink=pages.__setitem__)
+
+    assert len(pages) == page_count
+    assert pages == expected
+
+
+@pytest.mark.parametrize("namespace", ["http://www.w3.org/2000/svg", "urn:other", ""])
+def test_textarea_lines_become_spaced_tspans(namespace):
+    svg_root = ET.fromstring(
+        f'<svg xmlns="{namespace}"><textarea x="5">'
+        "<tspan>one</tspan><tbreak/><tspan>two</tspan><!-- note --><tbreak/><tspan>three</tspan>"
+        "</textarea></svg>"
+    )
+
+    convert_textarea_to_text(svg_root)
+
+    (text_elem,) = svg_root
+    assert ET.QName(text_elem).localname == "text"
+    assert [(tspan.text, tspan.get("x"), tspan.get("dy")) for tspan in text_elem.iterchildren(ET.Element)] == [
+        ("one", None, None),
+        ("two", "5", "1.2em"),
+        ("three", "5", "1.2em"),
+    ]
+
+
+def test_data_uris_are_only_cached_for_images_seen_twice(tmp_path):
+    iwb_path = make_iwb(tmp_path / "test.iwb")
+    uri_cache = {}
+
+    def embed():
+        svg_root = ET.Element("{http://www.w3.org/2000/svg}svg")
+        image = ET.SubElement(svg_root, "{http://www.w3.org/2000/svg}image")
+        image.set("{http://www.w3.org/1999/xlink}href", "images/big.png")
+        with zipfile.ZipFile(iwb_path) as z:
+            process_images_data_uri(svg_root, z, uri_cache)
+        return image.get("{http://www.w3.org/1999/xlink}href")
+
+    first = embed()
+    assert uri_cache == {"images/big.png": None}
+    assert embed() == first
+    assert uri_cache == {"images/big.png": first}
+    assert first.startswith("data:image/png;base64,")
@@ -0,0 +1,34 @@
+"""Tests for the helpers shared by the PDF engines."""
+
+import os
+import stat
+
+import pytest
+
+from newline_iwb_converter.pdf_engines.base import write_pdf_file
+
+
+def test_write_pdf_file_replaces_output_without_leftovers(tmp_path):
+    output_pdf = tmp_path / "out.pdf"
+    output_pdf.write_bytes(b"old")
+    umask = os.umask(0o022)
+    try:
+        write_pdf_file(output_pdf, b"%PDF-new")
+    finally:
+        os.umask(umask)
+
+    assert output_pdf.read_bytes() == b"%PDF-new"
+    assert [path.name for path in tmp_path.iterdir()] == ["out.pdf"]
+    # Created with the usual permissions, not private like most temporary files
+    assert stat.S_IMODE(os.stat(output_pdf).st_mode) == 0o644
+
+
+def test_write_pdf_file_removes_temporary_file_on_failure(tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError, match="replace failed"):
+        write_pdf_file(tmp_path / "out.pdf", b"%PDF-new")
+
+    assert list(tmp_path.iterdir()) == []
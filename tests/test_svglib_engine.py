@@ -0,0 +1,105 @@
+"""Tests for the svglib PDF engine."""
+
+import gzip
+
+import pytest
+from svglib.svglib import Svg2RlgAttributeConverter
+
+from newline_iwb_converter.pdf_engines import svglib_engine
+from newline_iwb_converter.pdf_engines.svglib_engine import SvglibEngine, _AttributeConverter, _svg2rlg
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    from PyPDF2 import PdfReader
+
+
+def make_svg(width, height, fill="red"):
+    """Build a small SVG page, as iwb2svg writes them."""
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?>\n'
+        f'<svg:svg xmlns:svg="http://www.w3.org/2000/svg" version="1.1" width="{width}" height="{height}">'
+        f'<svg:rect x="0" y="0" width="50" height="40" fill="{fill}"/>'
+        f'</svg:svg>'
+    ).encode()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_uniform_size_keeps_percentage_sized_pages(tmp_path, jobs):
+    # iwb2svg writes "100%" for pages without a size; they can only be
+    # measured by converting them, which must not consume the page
+    svg_pages = [
+        make_svg("100%", "100%", fill="red"),
+        make_svg(200, 100),
+        make_svg("100%", "100%", fill="blue"),
+    ]
+    output_pdf = tmp_path / "out.pdf"
+
+    SvglibEngine().combine_svg_bytes_to_pdf(svg_pages, output_pdf, uniform_size=True, jobs=jobs)
+
+    pages = PdfReader(str(output_pdf)).pages
+    assert len(pages) == 3
+    sizes = {(float(page.mediabox.width), float(page.mediabox.height)) for page in pages}
+    assert len(sizes) == 1
+
+
+@pytest.mark.parametrize("value", ["12", " 3.5 ", "-1e2", "10px", "2em", "1,2", "", "3pt"])
+def test_attribute_converter_matches_svglib(value):
+    assert _AttributeConverter().convertLength(value) == Svg2RlgAttributeConverter().convertLength(value)
+
+
+def test_svgz_pages_are_decompressed(tmp_path):
+    svgz_file = tmp_path / "page_0.svgz"
+    svgz_file.write_bytes(gzip.compress(make_svg(200, 100)))
+
+    drawing = _svg2rlg(str(svgz_file))
+    assert drawing is not None
+    assert (drawing.width, drawing.height) == (150, 75)
+    # Nothing is unpacked next to the file
+    assert [path.name for path in tmp_path.iterdir()] == ["page_0.svgz"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_combine_many_converts_remaining_decks_after_a_failure(tmp_path, jobs):
+    conversions = []
+    for name in ("first", "empty", "last"):
+        svg_dir = tmp_path / name
+        svg_dir.mkdir()
+        if name != "empty":
+            (svg_dir / "page_0.svg").write_bytes(make_svg(200, 100))
+        conversions.append((svg_dir, tmp_path / f"{name}.pdf", {}))
+
+    with pytest.raises(RuntimeError, match="empty.pdf") as excinfo:
+        SvglibEngine().combine_many(conversions, jobs=jobs)
+
+    assert isinstance(excinfo.value.__cause__, FileNotFoundError)
+    assert len(PdfReader(str(tmp_path / "first.pdf")).pages) == 1
+    assert len(PdfReader(str(tmp_path / "last.pdf")).pages) == 1
+    assert not (tmp_path / "empty.pdf").exists()
+
+
+def test_drawing_cache_is_pruned_once_per_pdf(tmp_path, monkeypatch):
+    monkeypatch.setenv(svglib_engine.CACHE_ENV_VAR, "1")
+    monkeypatch.setattr(svglib_engine, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(svglib_engine, "CACHE_MAX_BYTES", 0)
+    entries_before_pruning = []
+    prune_cache = svglib_engine._prune_cache
+
+    def count_and_prune():
+        entries_before_pruning.append(len(list(svglib_engine.CACHE_DIR.iterdir())))
+        prune_cache()
+
+    monkeypatch.setattr(svglib_engine, "_prune_cache", count_and_prune)
+    svg_pages = [make_svg(200, 100, fill) for fill in ("red", "green", "blue")]
+
+    SvglibEngine().combine_svg_bytes_to_pdf(svg_pages, tmp_path / "out.pdf", jobs=1)
+
+    # Storing the pages didn't prune, finishing the PDF did
+    assert entries_before_pruning == [3]
+    assert list(svglib_engine.CACHE_DIR.iterdir()) == []
+
+
+def test_drawing_cache_key_depends_on_reportlab_version(monkeypatch):
+    key = svglib_engine._cache_key(make_svg(200, 100))
+    monkeypatch.setattr(svglib_engine, "reportlab_version", "0.0")
+    assert svglib_engine._cache_key(make_svg(200, 100)) != key